@@ -10,7 +10,8 @@ def create_app():
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY')
 
     # Import and register the blueprint
-    from . import routes
+    from . import routes, metrics
     app.register_blueprint(routes.main_bp)
+    metrics.init_app(app)
 
     return app
\ No newline at end of file
@@ -1,14 +1,172 @@
 import google.generativeai as genai
+import hashlib
 import os
+import threading
+import time
 from dotenv import load_dotenv
 import markdown
 
+from . import metrics
+from .cache import DataCache
+from .coalesce import SingleFlight
+
 load_dotenv()
 
 # Configure Gemini API
 genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
 
-def analyze_player_performance(player_name, season_id, player_stats, zone_stats, league_comparison):
+# --- Configuration ---
+MODEL_NAME = os.getenv('GEMINI_MODEL', 'gemini-2.5-flash')  # 'stub' answers locally without calling Gemini
+AI_CACHE_TTL = int(os.getenv('AI_CACHE_TTL', 30 * 24 * 60 * 60))  # Seconds before a cached analysis is regenerated
+AI_CACHE_MAX_ENTRIES = int(os.getenv('AI_CACHE_MAX_ENTRIES', 5000))  # Oldest analyses are dropped beyond this
+AI_TIMEOUT = float(os.getenv('AI_TIMEOUT', 30))  # Seconds allowed for one generation before giving up
+AI_MAX_CONCURRENT = int(os.getenv('AI_MAX_CONCURRENT', 4))  # Generations in flight at once per process
+AI_QUEUE_TIMEOUT = float(os.getenv('AI_QUEUE_TIMEOUT', 5))  # Seconds to wait for a free slot before falling back
+
+# --- Caching ---
+# Rendered HTML keyed by a hash of (model, prompt). Prompts are built only from the stats,
+# so repeat views of the same player-season or matchup never call the model again.
+_analysis_cache = DataCache('ai_analysis', max_memory_items=256, max_disk_items=AI_CACHE_MAX_ENTRIES)
+_ANALYSIS_CACHE_VERSION = 2  # Bump when the cached HTML changes so old entries are ignored
+
+# --- Model client ---
+# One model instance is shared by every request; slow generations cannot pile up past
+# AI_MAX_CONCURRENT, and identical prompts in flight at the same time share one generation.
+_model = None
+_model_lock = threading.Lock()
+_generation_slots = threading.BoundedSemaphore(AI_MAX_CONCURRENT)
+_inflight = SingleFlight()
+
+
+class StubModel:
+    """
+    Offline stand-in for a Gemini model, for tests and benchmarks.
+    Returns a short, deterministic Markdown summary of the prompt.
+    """
+
+    model_name = 'stub'
+
+    class _Response:
+        def __init__(self, text):
+            self.text = text
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        first_line = prompt.strip().splitlines()[0]
+        digest = hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:12]
+        text = f"**Stub analysis** ({digest})\n\n{first_line}"
+        if stream:
+            # One chunk per word, like a streamed response
+            words = text.split(' ')
+            return [self._Response(chunk) for chunk in [words[0]] + [f" {word}" for word in words[1:]]]
+        return self._Response(text)
+
+
+def _to_html(markdown_text):
+    return markdown.markdown(markdown_text, extensions=['nl2br', 'tables'])
+
+
+class _MarkdownStream:
+    """
+    Convert streamed Markdown to HTML as it arrives.
+    Finished blocks (separated by a blank line) are converted once; only the block
+    still being written is re-converted on each chunk.
+
+    Block-wise HTML is only an approximation (a numbered list split by blank lines
+    restarts at 1 in every block), so it is used for partial updates only; the final
+    answer is converted from the full text.
+    """
+
+    def __init__(self):
+        self._finished_html = []
+        self._pending = ''
+        self.text = ''
+
+    def feed(self, text):
+        """Add a chunk of Markdown and return the HTML for everything received so far."""
+        self.text += text
+        self._pending += text
+        split = self._pending.rfind('\n\n')
+        if split != -1:
+            self._finished_html.append(_to_html(self._pending[:split]))
+            self._pending = self._pending[split + 2:]
+        return self.html()
+
+    def html(self):
+        return '\n'.join(self._finished_html + ([_to_html(self._pending)] if self._pending.strip() else []))
+
+
+def _get_model():
+    """Returns the shared model, creating it on first use."""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _model = StubModel() if MODEL_NAME == 'stub' else genai.GenerativeModel(MODEL_NAME)
+    return _model
+
+
+def set_model(model):
+    """Replace the shared model (e.g. with a StubModel for tests)."""
+    global _model
+    _model = model
+
+
+def _prompt_key(model, prompt):
+    """Cache key for a prompt answered by model, so answers from different models never mix."""
+    model_name = getattr(model, 'model_name', type(model).__name__)
+    return hashlib.sha256(f"{_ANALYSIS_CACHE_VERSION}\n{model_name}\n{prompt}".encode('utf-8')).hexdigest()
+
+
+def _generate_html(prompt, error_message, fallback_html, on_partial=None):
+    """
+    Run a prompt through the model and convert the Markdown answer to HTML.
+
+    Answers are cached. When every generation slot stays busy for AI_QUEUE_TIMEOUT
+    seconds, or the model fails or exceeds AI_TIMEOUT, fallback_html is returned
+    straight away and nothing is cached.
+
+    If on_partial is given, the answer is streamed and on_partial is called with the
+    HTML received so far after every chunk.
+    """
+    model = _get_model()
+    cache_key = _prompt_key(model, prompt)
+    cached = _analysis_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    return _inflight.do(cache_key, _generate_uncached, cache_key, model, prompt, error_message, fallback_html,
+                        on_partial)
+
+
+def _generate_uncached(cache_key, model, prompt, error_message, fallback_html, on_partial):
+    if not _generation_slots.acquire(timeout=AI_QUEUE_TIMEOUT):
+        print(f"{error_message}: all {AI_MAX_CONCURRENT} generation slots busy")
+        metrics.record_error('gemini_busy')
+        return fallback_html
+
+    start = time.perf_counter()
+    try:
+        if on_partial is None:
+            response = model.generate_content(prompt, request_options={'timeout': AI_TIMEOUT})
+            # Convert Markdown to HTML for better formatting
+            html_content = _to_html(response.text)
+        else:
+            converter = _MarkdownStream()
+            for chunk in model.generate_content(prompt, stream=True, request_options={'timeout': AI_TIMEOUT}):
+                on_partial(converter.feed(chunk.text))
+            html_content = _to_html(converter.text)
+    except Exception as e:
+        print(f"{error_message}: {e}")
+        metrics.record_error('gemini')
+        return fallback_html
+    finally:
+        _generation_slots.release()
+        metrics.observe('ai.generate', time.perf_counter() - start)
+
+    _analysis_cache.set(cache_key, html_content, ttl=AI_CACHE_TTL)
+    return html_content
+
+def analyze_player_performance(player_name, season_id, player_stats, zone_stats, league_comparison,
+                               on_partial=None):
     """
     Generate AI analysis of a player's performance for a specified season.
     
@@ -18,6 +176,7 @@ def analyze_player_performance(player_name, season_id, player_stats, zone_stats,
         player_stats: Dict with total_shots, made_shots, fg_percentage
         zone_stats: Dict with zone-by-zone statistics
         league_comparison: Dict with player vs league average by zone
+        on_partial: Optional callback receiving the HTML generated so far, to stream the answer
     
     Returns:
         String containing the AI analysis
@@ -63,19 +222,16 @@ Please provide a CONCISE analysis (100-150 words maximum) covering:
 
 Be direct and analytical. Focus only on the most important findings."""
 
-    try:
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        response = model.generate_content(prompt)
-        # Convert Markdown to HTML for better formatting
-        html_content = markdown.markdown(response.text, extensions=['nl2br', 'tables'])
-        return html_content
-    except Exception as e:
-        print(f"Error generating AI analysis: {e}")
-        return "<p>AI analysis is currently unavailable. Please try again later.</p>"
+    return _generate_html(
+        prompt,
+        "Error generating AI analysis",
+        "<p>AI analysis is currently unavailable. Please try again later.</p>",
+        on_partial
+    )
 
 
 def analyze_player_comparison(player1_name, player1_season, player1_stats, player1_zones,
-                              player2_name, player2_season, player2_stats, player2_zones):
+                              player2_name, player2_season, player2_stats, player2_zones, on_partial=None):
     """
     Generate AI analysis comparing two players' performances.
     
@@ -88,6 +244,7 @@ def analyze_player_comparison(player1_name, player1_season, player1_stats, playe
         player2_season: Second player's season
         player2_stats: Second player's overall stats dict
         player2_zones: Second player's zone statistics dict
+        on_partial: Optional callback receiving the HTML generated so far, to stream the answer
     
     Returns:
         String containing the comparative AI analysis
@@ -134,12 +291,9 @@ Provide a CONCISE, DEFINITIVE analysis (100-150 words maximum):
 
 Be bold and decisive. Pick a winner and defend it. No hedging, no "it depends", no "both are great in different ways". CHOOSE ONE."""
 
-    try:
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        response = model.generate_content(prompt)
-        # Convert Markdown to HTML for better formatting
-        html_content = markdown.markdown(response.text, extensions=['nl2br', 'tables'])
-        return html_content
-    except Exception as e:
-        print(f"Error generating comparison analysis: {e}")
-        return "<p>AI comparison analysis is currently unavailable. Please try again later.</p>"
\ No newline at end of file
+    return _generate_html(
+        prompt,
+        "Error generating comparison analysis",
+        "<p>AI comparison analysis is currently unavailable. Please try again later.</p>",
+        on_partial
+    )
\ No newline at end of file
@@ -0,0 +1,64 @@
+from . import data, stats, warehouse
+from .cache import DataCache
+
+# --- Caching ---
+# One baseline per (season_id, season_type). The league averages table is the same for every
+# player in a season, so it is aggregated once and the SQLite tier shares it across workers.
+_BASELINE_VERSION = 1  # Bump when the baseline layout changes so old entries are ignored
+_baseline_cache = DataCache('league_baselines', max_memory_items=256)
+
+
+def _breakdown(league_avg_df, column):
+    """Sum FGM/FGA per value of one zone column."""
+    grouped = league_avg_df.groupby(column, sort=False)[['FGM', 'FGA']].sum()
+    return {
+        zone: {'FGM': int(row.FGM), 'FGA': int(row.FGA), 'FG_PCT': float(row.FGM / row.FGA) if row.FGA else 0.0}
+        for zone, row in grouped.iterrows()
+    }
+
+
+def build_baseline(league_avg_df):
+    """
+    Aggregate a LeagueAverages frame into the lookups used for player comparisons.
+
+    Returns:
+        dict with:
+            range: {'fgm', 'fga'} arrays aligned with stats.ZONE_ORDER (stats.aggregate_league output)
+            basic, area: {zone: {'FGM', 'FGA', 'FG_PCT'}} by SHOT_ZONE_BASIC and SHOT_ZONE_AREA
+    """
+    return {
+        'range': stats.aggregate_league(league_avg_df),
+        'basic': _breakdown(league_avg_df, 'SHOT_ZONE_BASIC'),
+        'area': _breakdown(league_avg_df, 'SHOT_ZONE_AREA')
+    }
+
+
+def get_league_baseline(season_id, season_type='Regular Season', league_avg_df=None):
+    """
+    Look up the league baseline for a season, building it on first use.
+    Finished seasons are kept forever; the current season expires with its shot data.
+
+    The source frame is, in order: league_avg_df if given (every shot chart response
+    carries it), then the local warehouse.
+
+    Args:
+        season_id: Season ID, e.g. '2022-23'
+        season_type: Season type, e.g. 'Regular Season'
+        league_avg_df: LeagueAverages frame already in hand, used only when the baseline is not stored
+
+    Returns:
+        dict: build_baseline output, or None if no league averages are available for the season.
+    """
+    cache_key = (_BASELINE_VERSION, season_id, season_type)
+    baseline = _baseline_cache.get(cache_key)
+    if baseline is not None:
+        return baseline
+
+    if league_avg_df is None or league_avg_df.empty:
+        league_avg_df = warehouse.read_league_averages(season_id, season_type)
+    if league_avg_df is None or league_avg_df.empty:
+        return None
+
+    baseline = build_baseline(league_avg_df)
+    _baseline_cache.set(cache_key, baseline, ttl=data.season_ttl(season_id))
+    return baseline
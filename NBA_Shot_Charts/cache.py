@@ -0,0 +1,235 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# --- Configuration ---
+CACHE_DIR = os.getenv('NBA_CACHE_DIR', '.nba_cache')
+DEFAULT_MEMORY_ITEMS = 128
+
+# Every cache created in this process, so metrics can report hit ratios
+_registry = []
+
+
+def _key_to_str(key):
+    """Turn a tuple key into a stable string usable as a SQLite primary key."""
+    if isinstance(key, tuple):
+        return '|'.join(str(part) for part in key)
+    return str(key)
+
+
+def all_caches():
+    """Returns every DataCache created in this process."""
+    return list(_registry)
+
+
+class DataCache:
+    """
+    Two-tier cache: an in-process LRU in front of a SQLite file on disk.
+
+    Values are pickled on disk, so anything picklable (DataFrames, dicts, strings)
+    can be stored. Entries written with ttl=None never expire. The memory tier is
+    bounded by entry count and, optionally, by the pickled size of its entries; the
+    disk tier can optionally be bounded by entry count, dropping the oldest first.
+    """
+
+    def __init__(self, name, max_memory_items=DEFAULT_MEMORY_ITEMS, cache_dir=None,
+                 max_memory_bytes=None, persist=True, max_disk_items=None):
+        """
+        Args:
+            name: Cache name, used as the SQLite file name
+            max_memory_items: Number of entries kept in the in-process LRU
+            cache_dir: Directory for the SQLite file (default: NBA_CACHE_DIR)
+            max_memory_bytes: Optional byte budget for the in-process LRU
+            persist: Whether to keep a copy of every entry on disk
+            max_disk_items: Optional limit on the number of entries kept on disk
+        """
+        self.name = name
+        self.max_memory_items = max_memory_items
+        self.max_memory_bytes = max_memory_bytes
+        self.persist = persist
+        self.max_disk_items = max_disk_items
+        self.path = os.path.join(cache_dir or CACHE_DIR, f"{name}.sqlite3")
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.RLock()
+        self._conn = None
+        _registry.append(self)
+
+    def _connection(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS entries ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL, created_at REAL NOT NULL)'
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _remember(self, key, value, expires_at, size):
+        self._forget(key)
+        self._memory[key] = (value, expires_at, size)
+        self._memory_bytes += size
+        while self._memory and (
+            len(self._memory) > self.max_memory_items
+            or (self.max_memory_bytes is not None and self._memory_bytes > self.max_memory_bytes)
+        ):
+            _, (_, _, evicted_size) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted_size
+
+    def _forget(self, key):
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= entry[2]
+
+    def get(self, key, default=None):
+        """
+        Look up a key, checking memory first and then disk.
+
+        Returns:
+            The cached value, or default if missing or expired.
+        """
+        key = _key_to_str(key)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, expires_at, _ = entry
+                if expires_at is None or expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._forget(key)
+
+            row = None
+            if self.persist:
+                row = self._connection().execute(
+                    'SELECT value, expires_at FROM entries WHERE key = ?', (key,)
+                ).fetchone()
+            if row is None or (row[1] is not None and row[1] <= now):
+                self.misses += 1
+                return default
+
+            value = pickle.loads(row[0])
+            self._remember(key, value, row[1], len(row[0]))
+            self.hits += 1
+            return value
+
+    def get_stale(self, key, max_stale=None):
+        """
+        Look up a key, also returning entries that have expired (for stale-while-revalidate).
+
+        Args:
+            key: Cache key (string or tuple)
+            max_stale: Optional seconds past expiry after which an entry is treated as missing
+
+        Returns:
+            tuple: (value, is_fresh), or (None, False) if there is no usable entry.
+        """
+        str_key = _key_to_str(key)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(str_key)
+            if entry is not None:
+                value, expires_at = entry[0], entry[1]
+            else:
+                row = None
+                if self.persist:
+                    row = self._connection().execute(
+                        'SELECT value, expires_at FROM entries WHERE key = ?', (str_key,)
+                    ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None, False
+                value, expires_at = pickle.loads(row[0]), row[1]
+
+            is_fresh = expires_at is None or expires_at > now
+            if not is_fresh and max_stale is not None and expires_at + max_stale <= now:
+                self.misses += 1
+                return None, False
+            if is_fresh:
+                self.hits += 1
+                if entry is None:
+                    self._remember(str_key, value, expires_at, len(row[0]))
+                else:
+                    self._memory.move_to_end(str_key)
+            else:
+                self.misses += 1
+            return value, is_fresh
+
+    def set(self, key, value, ttl=None):
+        """
+        Store a value in memory and on disk.
+
+        Args:
+            key: Cache key (string or tuple)
+            value: Any picklable value
+            ttl: Seconds until the entry expires, or None to keep it forever
+        """
+        key = _key_to_str(key)
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            if self.persist:
+                conn = self._connection()
+                conn.execute(
+                    'INSERT OR REPLACE INTO entries (key, value, expires_at, created_at) VALUES (?, ?, ?, ?)',
+                    (key, blob, expires_at, now)
+                )
+                if self.max_disk_items is not None:
+                    self._trim_disk(conn, now)
+                conn.commit()
+            self._remember(key, value, expires_at, len(blob))
+
+    def _trim_disk(self, conn, now):
+        """Drop expired entries, then the oldest ones beyond max_disk_items."""
+        conn.execute('DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?', (now,))
+        conn.execute(
+            'DELETE FROM entries WHERE key IN ('
+            'SELECT key FROM entries ORDER BY created_at DESC LIMIT -1 OFFSET ?)',
+            (self.max_disk_items,)
+        )
+
+    def purge_expired(self):
+        """
+        Delete expired entries from disk; get() only skips them.
+
+        Returns:
+            int: Number of entries deleted.
+        """
+        if not self.persist:
+            return 0
+        with self._lock:
+            conn = self._connection()
+            deleted = conn.execute(
+                'DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?', (time.time(),)
+            ).rowcount
+            conn.commit()
+            return deleted
+
+    def delete(self, key):
+        """Remove a single entry from both tiers."""
+        key = _key_to_str(key)
+        with self._lock:
+            self._forget(key)
+            if self.persist:
+                conn = self._connection()
+                conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+                conn.commit()
+
+    def clear(self):
+        """Remove every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if self.persist:
+                conn = self._connection()
+                conn.execute('DELETE FROM entries')
+                conn.commit()
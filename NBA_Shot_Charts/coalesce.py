@@ -0,0 +1,75 @@
+from concurrent.futures import Future
+from contextlib import contextmanager
+import hashlib
+import os
+import threading
+
+try:
+    import fcntl  # POSIX only; without it, coalescing stays within one process
+except ImportError:
+    fcntl = None
+
+from .cache import CACHE_DIR
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls for the same key into one.
+
+    The first caller for a key runs the function; callers arriving while it is
+    still running wait for and share its result (or exception) instead of
+    starting their own.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        Run fn(*args, **kwargs) unless a call for key is already in flight.
+
+        Returns:
+            The function's result, shared with any callers that joined this call.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return future.result()
+
+
+@contextmanager
+def process_lock(name, key, lock_dir=None):
+    """
+    Hold an exclusive lock shared by every process using the same lock directory
+    (e.g. all gunicorn workers), for one key.
+
+    Lock files live in <NBA_CACHE_DIR>/locks and are left in place for reuse.
+    On platforms without fcntl this only yields, with no locking.
+    """
+    if fcntl is None:
+        yield
+        return
+
+    lock_dir = lock_dir or os.path.join(CACHE_DIR, 'locks')
+    os.makedirs(lock_dir, exist_ok=True)
+    digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:20]
+    with open(os.path.join(lock_dir, f"{name}-{digest}.lock"), 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
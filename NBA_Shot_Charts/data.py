@@ -1,17 +1,57 @@
-from nba_api.stats.static import players
-from nba_api.stats.endpoints import shotchartdetail, playercareerstats
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+import os
+import threading
+
+import numpy as np
+
+from . import metrics, resilience, warehouse
+from .cache import DataCache
+from .coalesce import SingleFlight, process_lock
+from .providers import get_provider
+from .search import PlayerSearchIndex
 
 # --- Constants ---
 EARLIEST_SEASON_YEAR = 2000  # Only show seasons from 2000 onwards
+CURRENT_SEASON_TTL = int(os.getenv('CURRENT_SEASON_TTL', 6 * 60 * 60))  # Seconds before current-season shots are refetched
+CAREER_TTL = int(os.getenv('CAREER_TTL', 24 * 60 * 60))  # Seconds before a player's career table is refetched
+UPSTREAM_MAX_WORKERS = int(os.getenv('UPSTREAM_MAX_WORKERS', 4))  # Max concurrent stats.nba.com fetches per process
+PLAYER_INDEX_TTL = int(os.getenv('PLAYER_INDEX_TTL', 24 * 60 * 60))  # Seconds before the saved player index is rebuilt
+STALE_MAX_AGE = int(os.getenv('STALE_MAX_AGE', 7 * 24 * 60 * 60))  # Seconds past expiry an entry may still be served while it refreshes
+
+# The only ShotChartDetail columns the app reads, and the narrow dtypes they are kept in
+SHOT_COLUMNS = {
+    'LOC_X': np.int16,
+    'LOC_Y': np.int16,
+    'SHOT_MADE_FLAG': bool,
+    'EVENT_TYPE': 'category',
+    'SHOT_DISTANCE': np.int16,
+    'ACTION_TYPE': 'category',
+    'SHOT_ZONE_RANGE': 'category',
+}
 
 # --- Caching ---
-# Fetch the player list once when the module is first imported
-print("Fetching and caching player data...")
-_all_players = players.get_players()
-_player_name_map = {player['full_name'].lower(): player for player in _all_players}
-print("Player data cached.")
+# The player list and name lookup are built on first use rather than at import,
+# and a snapshot is saved so later workers load it with a single read
+_player_index = None
+_player_index_lock = threading.Lock()
+_player_index_cache = DataCache('players', max_memory_items=1)
+_PLAYER_INDEX_VERSION = 2  # Bump when the index layout changes so old snapshots are ignored
+
+# Compact shot frames and league averages keyed by (version, player_id, season_id, season_type)
+_SHOT_CACHE_VERSION = 2  # Bump when the cached frame layout changes so old entries are ignored
+_shot_cache = DataCache('shotcharts')
+# Career tables keyed by player_id: {'seasons': [...], 'team_ids': {season_id: team_id}}
+_career_cache = DataCache('careers')
 
-def _season_year_from_id(season_id):
+# Concurrent requests for the same career or shot chart share one upstream fetch
+_career_flight = SingleFlight()
+_shot_flight = SingleFlight()
+
+# Shared, bounded pool for fetching several players at once
+_fetch_pool = ThreadPoolExecutor(max_workers=UPSTREAM_MAX_WORKERS, thread_name_prefix='nba-fetch')
+
+def season_year_from_id(season_id):
     """
     Extract the starting year from a season ID.
     Example: '2022-23' returns 2022, '1999-00' returns 1999
@@ -21,65 +61,261 @@ def _season_year_from_id(season_id):
     except (ValueError, IndexError):
         return 0
 
+def season_id_from_year(year):
+    """
+    Build a season ID from its starting year.
+    Example: 2022 returns '2022-23', 1999 returns '1999-00'
+    """
+    return f"{year}-{str(year + 1)[-2:]}"
+
+def current_season_year(today=None):
+    """
+    Return the starting year of the season in progress.
+    The NBA season starts in October, so January-September belong to the previous year's season.
+    """
+    today = today or date.today()
+    return today.year if today.month >= 10 else today.year - 1
+
+def is_season_finished(season_id):
+    """True for seasons before the one in progress; their data never changes."""
+    return season_year_from_id(season_id) < current_season_year()
+
+def season_ttl(season_id):
+    """Finished seasons never change, so they are cached forever; the current season expires."""
+    if is_season_finished(season_id):
+        return None
+    return CURRENT_SEASON_TTL
+
+def compact_shots(shot_df):
+    """
+    Project a ShotChartDetail frame to SHOT_COLUMNS with narrow dtypes.
+    Coordinates become int16, the made flag a bool and the text columns categoricals.
+    """
+    if shot_df.empty:
+        shot_df = shot_df.reindex(columns=list(SHOT_COLUMNS))
+    return shot_df[list(SHOT_COLUMNS)].astype(SHOT_COLUMNS).reset_index(drop=True)
+
+def _call_upstream(source, fn, *args, rate_wait=None):
+    """
+    Call the data provider, timing it as stage 'upstream.<source>' and counting failures.
+    Remote providers are called through the resilience layer (rate limit, retries, circuit
+    breaker), with rate_wait passed on to resilience.call; local ones are called directly.
+    """
+    with metrics.timed(f"upstream.{source}"):
+        try:
+            if not get_provider().remote:
+                return fn(*args)
+            return resilience.call(fn, *args, rate_wait=rate_wait)
+        except resilience.UpstreamUnavailableError:
+            metrics.record_error(f"{source}_rejected")
+            raise
+        except Exception:
+            metrics.record_error(source)
+            raise
+
+def _get_player_index():
+    """
+    Returns the player index, building it on first call.
+
+    Returns:
+        dict: {'players': list of player dicts, 'by_name': dict of lowercased full name -> player,
+               'search': PlayerSearchIndex}
+    """
+    global _player_index
+    if _player_index is not None:
+        return _player_index
+
+    with _player_index_lock:
+        if _player_index is None:
+            cache_key = ('index', _PLAYER_INDEX_VERSION)
+            index = _player_index_cache.get(cache_key)
+            if index is None:
+                # The player list ships with nba_api (no network call), so it bypasses the upstream guards
+                with metrics.timed('upstream.players'):
+                    all_players = get_provider().get_players()
+                index = {
+                    'players': all_players,
+                    'by_name': {player['full_name'].lower(): player for player in all_players},
+                    'search': PlayerSearchIndex(all_players)
+                }
+                _player_index_cache.set(cache_key, index, ttl=PLAYER_INDEX_TTL)
+            _player_index = index
+    return _player_index
+
 def get_all_players():
     """
     Returns the cached list of all NBA players.
     Note: Seasons will be filtered to only show 2000 onwards when a player is selected.
     """
-    return _all_players
+    return _get_player_index()['players']
 
 def find_player(player_name):
     """
     Finds a player by full name from the cached list.
+    Falls back to an accent-insensitive match, so 'Nikola Jokic' finds 'Nikola Jokić'.
     
     Returns:
         dict: Player dictionary or None if not found.
     """
-    return _player_name_map.get(player_name.lower())
+    index = _get_player_index()
+    return index['by_name'].get(player_name.lower()) or index['search'].find_exact(player_name)
+
+def search_players(query, limit=10, offset=0, active_only=False):
+    """
+    Prefix and typo-tolerant player name search.
+
+    Returns:
+        tuple: (list of player dicts for the requested page, total number of matches)
+    """
+    return _get_player_index()['search'].search(query, limit=limit, offset=offset, active_only=active_only)
+
+def get_player_career(player_id):
+    """
+    Returns a player's career table from the career store, fetching it on a miss.
+    Entries are invalidated after CAREER_TTL seconds so new seasons and trades show up;
+    an expired entry is still returned while it is refreshed in the background.
+
+    Returns:
+        dict: {'seasons': list of season IDs, 'team_ids': dict mapping season ID to team ID}
+    """
+    cache_key = int(player_id)
+    career, is_fresh = _career_cache.get_stale(cache_key, max_stale=STALE_MAX_AGE)
+    if career is not None:
+        if not is_fresh:
+            resilience.refresh_in_background(('career', cache_key), _career_flight.do,
+                                             cache_key, _load_player_career, cache_key)
+        return career
+    return _career_flight.do(cache_key, _load_player_career, cache_key)
+
+def _load_player_career(cache_key):
+    """Fetch and cache one career table, at most once across all workers at a time."""
+    with process_lock('career', cache_key):
+        career = _career_cache.get(cache_key)
+        if career is not None:
+            return career
+
+        career_df = _call_upstream('career', get_provider().get_player_career, cache_key)
+
+        # Traded players have one row per team; keep the first team listed for each season
+        first_rows = career_df.drop_duplicates(subset='SEASON_ID', keep='first')
+        career = {
+            'seasons': first_rows['SEASON_ID'].tolist(),
+            'team_ids': {season: int(team_id) for season, team_id in zip(first_rows['SEASON_ID'], first_rows['TEAM_ID'])}
+        }
+        _career_cache.set(cache_key, career, ttl=CAREER_TTL)
+        return career
 
 def get_player_career_seasons(player_id):
     """
-    Fetches the career statistics for a player and returns a list of seasons they played.
+    Returns a list of seasons a player played, using the career store.
     Only returns seasons from 2000 onwards.
     """
-    career = playercareerstats.PlayerCareerStats(player_id=player_id)
-    career_df = career.get_data_frames()[0]
-    
     # Filter seasons to only include 2000 onwards
-    all_seasons = career_df['SEASON_ID'].unique().tolist()
+    all_seasons = get_player_career(player_id)['seasons']
     filtered_seasons = [
         season for season in all_seasons 
-        if _season_year_from_id(season) >= EARLIEST_SEASON_YEAR
+        if season_year_from_id(season) >= EARLIEST_SEASON_YEAR
     ]
     
     # Return a sorted list (most recent first)
     return sorted(filtered_seasons, reverse=True)
 
-def get_player_shotchartdetail(player_id, season_id):
+@metrics.timed('data.shot_chart')
+def get_player_shotchartdetail(player_id, season_id, season_type='Regular Season', rate_wait=None):
     """
     Fetch shot chart data for a specific player and season.
-    Only allows seasons from 2000 onwards.
+    Only allows seasons from 2000 onwards. rate_wait is passed on to resilience.call.
+
+    Results are cached by (player_id, season_id, season_type). Finished seasons are
+    kept forever; the current season is refetched after CURRENT_SEASON_TTL seconds,
+    serving the expired copy while the refresh runs in the background.
+
+    Returns:
+        tuple: (shot_df, league_avg_df), with shot_df in the compact layout from compact_shots
     """
     # Validate season year
-    season_year = _season_year_from_id(season_id)
+    season_year = season_year_from_id(season_id)
     if season_year < EARLIEST_SEASON_YEAR:
         raise ValueError(f"Season {season_id} is before {EARLIEST_SEASON_YEAR}. Only seasons from {EARLIEST_SEASON_YEAR} onwards are supported.")
-    
-    career = playercareerstats.PlayerCareerStats(player_id=player_id)
-    career_df = career.get_data_frames()[0]
 
-    season_data = career_df[career_df['SEASON_ID'] == season_id]
-    if season_data.empty:
+    cache_key = (_SHOT_CACHE_VERSION, int(player_id), season_id, season_type)
+    cached, is_fresh = _shot_cache.get_stale(cache_key, max_stale=STALE_MAX_AGE)
+    if cached is not None:
+        if not is_fresh:
+            resilience.refresh_in_background(cache_key, _shot_flight.do, cache_key, _load_player_shotchartdetail,
+                                             cache_key, player_id, season_id, season_type)
+        return cached
+
+    return _shot_flight.do(cache_key, _load_player_shotchartdetail, cache_key, player_id, season_id, season_type,
+                           rate_wait)
+
+def _load_player_shotchartdetail(cache_key, player_id, season_id, season_type, rate_wait=None):
+    """
+    Fetch and cache one shot chart, at most once across all workers at a time.
+    A worker that waited on the lock finds the other worker's result in the cache.
+    """
+    with process_lock('shotchart', cache_key):
+        cached = _shot_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        shot_df, league_avg_df = _fetch_player_shotchartdetail(player_id, season_id, season_type, rate_wait)
+        result = (compact_shots(shot_df), league_avg_df)
+        _shot_cache.set(cache_key, result, ttl=season_ttl(season_id))
+        return result
+
+def _fetch_player_shotchartdetail(player_id, season_id, season_type, rate_wait=None):
+    """
+    Load a player's shots and the league averages for one season.
+    Finished seasons are served from the local warehouse when ingested, which resolves the
+    player's team from its own rows, so no upstream call is needed for them; the data provider
+    is the fallback.
+    """
+    if is_season_finished(season_id):
+        with metrics.timed('warehouse.read'):
+            stored = warehouse.read_player_shots(player_id, None, season_id, season_type,
+                                                 columns=list(SHOT_COLUMNS))
+        if stored is not None:
+            return stored
+
+    team_id = get_player_career(player_id)['team_ids'].get(season_id)
+    if team_id is None:
         raise ValueError(f"Player did not play in the {season_id} season")
 
-    team_id = season_data.iloc[0]['TEAM_ID']
+    return _call_upstream('shot_chart', get_provider().get_shot_chart, player_id, team_id, season_id, season_type,
+                          rate_wait=rate_wait)
+
+def get_player_shotchartdetails(requests, season_type='Regular Season'):
+    """
+    Fetch shot chart data for several players (or seasons) concurrently.
+    Upstream calls may queue for a request slot long enough for the whole batch to pass the rate limit.
+
+    Args:
+        requests: Dict mapping a label (e.g. the player's name) to a (player_id, season_id) tuple
+        season_type: Season type shared by every request
 
-    shotchartlist = shotchartdetail.ShotChartDetail(
-        team_id=int(team_id),
-        player_id=int(player_id),
-        season_type_all_star='Regular Season',
-        season_nullable=season_id,
-        context_measure_simple='FGA'
-    ).get_data_frames()
+    Returns:
+        dict: Label -> (shot_df, league_avg_df), in the same order as requests
+
+    Raises:
+        ValueError: If any player's fetch is invalid; the message is prefixed with that player's label.
+        Other exceptions from a player's fetch are re-raised unchanged.
+    """
+    rate_wait = resilience.batch_rate_wait(len(requests))
+    # Stages timed in the pool threads still count towards this request's X-Profile breakdown
+    fetch = metrics.with_profile(get_player_shotchartdetail)
+    futures = {
+        label: _fetch_pool.submit(fetch, player_id, season_id, season_type, rate_wait)
+        for label, (player_id, season_id) in requests.items()
+    }
 
-    return shotchartlist[0], shotchartlist[1]
\ No newline at end of file
+    results = {}
+    for label, future in futures.items():
+        try:
+            results[label] = future.result()
+        except ValueError as ve:
+            raise ValueError(f"{label}: {ve}") from ve
+        except Exception as e:
+            print(f"Error fetching shot data for {label}: {e}")
+            raise
+    return results
@@ -0,0 +1,87 @@
+from concurrent.futures import ThreadPoolExecutor
+import itertools
+import os
+import time
+import uuid
+
+from . import metrics
+from .cache import DataCache
+
+# --- Configuration ---
+JOB_MAX_WORKERS = int(os.getenv('JOB_MAX_WORKERS', 4))  # Background jobs (e.g. AI analysis) run at once per process
+JOB_TTL = int(os.getenv('JOB_TTL', 60 * 60))  # Seconds a finished job's result can still be fetched
+JOB_PURGE_INTERVAL = int(os.getenv('JOB_PURGE_INTERVAL', 100))  # Submits between deletions of expired jobs
+
+# --- Job store ---
+# Job state lives in SQLite only (no in-process tier), so whichever worker serves a
+# poll sees the latest status written by the worker running the job.
+_job_store = DataCache('jobs', max_memory_items=0)
+_job_pool = ThreadPoolExecutor(max_workers=JOB_MAX_WORKERS, thread_name_prefix='job')
+_submit_count = itertools.count(1)
+
+PENDING = 'pending'
+DONE = 'done'
+FAILED = 'failed'
+
+
+def _run(job_id, fn, args, kwargs, progress_kwarg, deadline, submitted_at, max_queue_wait):
+    queue_wait = time.time() - submitted_at
+    metrics.observe('jobs.queue_wait', queue_wait)
+    if max_queue_wait is not None and queue_wait > max_queue_wait:
+        print(f"Background job {job_id} dropped after waiting {queue_wait:.1f}s for a worker")
+        metrics.record_error('jobs_queue_full')
+        _job_store.set(job_id, {'status': FAILED, 'error': 'Job queue is full'}, ttl=JOB_TTL)
+        return
+
+    if progress_kwarg is not None:
+        kwargs = dict(kwargs, **{progress_kwarg: lambda partial: _publish_partial(job_id, partial, deadline)})
+    try:
+        _job_store.set(job_id, {'status': DONE, 'result': fn(*args, **kwargs)}, ttl=JOB_TTL)
+    except Exception as e:
+        print(f"Background job {job_id} failed: {e}")
+        _job_store.set(job_id, {'status': FAILED, 'error': str(e)}, ttl=JOB_TTL)
+
+
+def _publish_partial(job_id, partial, deadline):
+    _job_store.set(job_id, {'status': PENDING, 'partial': partial, 'deadline': deadline}, ttl=JOB_TTL)
+
+
+def submit(fn, *args, progress_kwarg=None, timeout=None, max_queue_wait=None, **kwargs):
+    """
+    Run fn(*args, **kwargs) in the background job pool.
+
+    If progress_kwarg is set, fn also receives a callback under that keyword argument;
+    each value passed to it is stored as the job's 'partial' result while it runs.
+
+    If timeout is set, a job still pending that many seconds after submission is reported
+    as failed, so callers stop waiting on a job whose worker was recycled or killed.
+
+    If max_queue_wait is set, a job that waits longer than that for a free worker is not
+    run and fails straight away, so a backlog cannot build up behind slow jobs.
+
+    Returns:
+        str: Job ID to pass to get_job
+    """
+    # Expired jobs are only skipped by get(), so delete them every JOB_PURGE_INTERVAL submits
+    if next(_submit_count) % JOB_PURGE_INTERVAL == 0:
+        _job_store.purge_expired()
+
+    job_id = uuid.uuid4().hex
+    submitted_at = time.time()
+    deadline = submitted_at + timeout if timeout is not None else None
+    _job_store.set(job_id, {'status': PENDING, 'deadline': deadline}, ttl=JOB_TTL)
+    _job_pool.submit(_run, job_id, fn, args, kwargs, progress_kwarg, deadline, submitted_at, max_queue_wait)
+    return job_id
+
+
+def get_job(job_id):
+    """
+    Returns:
+        dict: {'status': 'pending'} (with 'partial' once progress is reported),
+              {'status': 'done', 'result': ...} or {'status': 'failed', 'error': str},
+              or None for an unknown or expired job.
+    """
+    job = _job_store.get(job_id)
+    if job is not None and job['status'] == PENDING and job.get('deadline') and time.time() > job['deadline']:
+        return {'status': FAILED, 'error': 'Timed out'}
+    return job
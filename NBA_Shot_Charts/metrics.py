@@ -0,0 +1,165 @@
+from collections import Counter
+from contextlib import contextmanager
+import functools
+import os
+import threading
+import time
+
+from flask import g, has_request_context, request, template_rendered, before_render_template
+
+from .cache import all_caches
+from .resilience import upstream_state
+
+# --- Configuration ---
+# Requests carrying this header get a Server-Timing header with their stage breakdown
+PROFILE_HEADER = 'X-Profile'
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', '1') == '1'
+HISTOGRAM_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)  # Seconds
+
+# --- State ---
+_lock = threading.Lock()
+_stages = {}  # stage -> {'buckets': [count per bucket], 'sum': seconds, 'count': n}
+_errors = Counter()  # upstream source -> error count
+_local = threading.local()  # Profile carried into pool threads by with_profile
+
+
+def _current_profile():
+    if has_request_context():
+        return g.get('profile')
+    return getattr(_local, 'profile', None)
+
+
+def observe(stage, seconds):
+    """Record one duration for a stage, and add it to the current request's profile if one is active."""
+    with _lock:
+        histogram = _stages.get(stage)
+        if histogram is None:
+            histogram = _stages[stage] = {'buckets': [0] * len(HISTOGRAM_BUCKETS), 'sum': 0.0, 'count': 0}
+        for i, bound in enumerate(HISTOGRAM_BUCKETS):
+            if seconds <= bound:
+                histogram['buckets'][i] += 1
+        histogram['sum'] += seconds
+        histogram['count'] += 1
+
+    profile = _current_profile()
+    if profile is not None:
+        profile.append((stage, seconds))
+
+
+@contextmanager
+def timed(stage):
+    """
+    Time the enclosed block as one observation of stage.
+    Example: with metrics.timed('upstream.shot_chart'): ...
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - start)
+
+
+def with_profile(fn):
+    """
+    Wrap fn so the stages it times land in the current request's profile even when
+    it runs in another thread (e.g. a thread pool), where Flask's g is not available.
+    """
+    profile = _current_profile()
+    if profile is None:
+        return fn
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        _local.profile = profile
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _local.profile = None
+    return run
+
+
+def record_error(source):
+    """Count a failed call to an upstream service (e.g. 'shot_chart', 'gemini')."""
+    with _lock:
+        _errors[source] += 1
+
+
+def render_prometheus():
+    """
+    Returns:
+        str: All stage histograms, upstream error counters, the upstream circuit state and cache hit/miss counts
+             in the Prometheus text exposition format.
+
+    Every series covers this process only and carries a pid label; under gunicorn each
+    worker must be scraped (or the series summed across pids) to get totals.
+    """
+    pid = f'pid="{os.getpid()}"'
+    lines = [
+        '# HELP nba_stage_seconds Time spent in each stage of request handling.',
+        '# TYPE nba_stage_seconds histogram'
+    ]
+    with _lock:
+        for stage, histogram in sorted(_stages.items()):
+            for bound, count in zip(HISTOGRAM_BUCKETS, histogram['buckets']):
+                lines.append(f'nba_stage_seconds_bucket{{{pid},stage="{stage}",le="{bound}"}} {count}')
+            lines.append(f'nba_stage_seconds_bucket{{{pid},stage="{stage}",le="+Inf"}} {histogram["count"]}')
+            lines.append(f'nba_stage_seconds_sum{{{pid},stage="{stage}"}} {histogram["sum"]:.6f}')
+            lines.append(f'nba_stage_seconds_count{{{pid},stage="{stage}"}} {histogram["count"]}')
+
+        lines += ['# HELP nba_upstream_errors_total Failed calls to upstream services.',
+                  '# TYPE nba_upstream_errors_total counter']
+        for source, count in sorted(_errors.items()):
+            lines.append(f'nba_upstream_errors_total{{{pid},source="{source}"}} {count}')
+
+    lines += ['# HELP nba_upstream_circuit_open Whether calls to the NBA stats service are being refused (1) or not (0).',
+              '# TYPE nba_upstream_circuit_open gauge',
+              f'nba_upstream_circuit_open{{{pid}}} {int(upstream_state() == "open")}']
+
+    lines += ['# HELP nba_cache_hits_total Cache lookups answered from the cache.',
+              '# TYPE nba_cache_hits_total counter']
+    caches = all_caches()
+    for cache in caches:
+        lines.append(f'nba_cache_hits_total{{{pid},cache="{cache.name}"}} {cache.hits}')
+    lines += ['# HELP nba_cache_misses_total Cache lookups that were not in the cache.',
+              '# TYPE nba_cache_misses_total counter']
+    for cache in caches:
+        lines.append(f'nba_cache_misses_total{{{pid},cache="{cache.name}"}} {cache.misses}')
+    lines += ['# HELP nba_cache_hit_ratio Share of lookups answered from the cache.',
+              '# TYPE nba_cache_hit_ratio gauge']
+    for cache in caches:
+        lookups = cache.hits + cache.misses
+        lines.append(f'nba_cache_hit_ratio{{{pid},cache="{cache.name}"}} {cache.hits / lookups if lookups else 0:.4f}')
+
+    return '\n'.join(lines) + '\n'
+
+
+def _server_timing(profile):
+    """Format a stage breakdown as a Server-Timing header value (durations in milliseconds)."""
+    return ', '.join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in profile)
+
+
+def init_app(app):
+    """Time every request and rendered template, and answer profiling requests."""
+
+    @app.before_request
+    def start_timer():
+        g.request_start = time.perf_counter()
+        g.profile = [] if PROFILING_ENABLED and request.headers.get(PROFILE_HEADER) else None
+
+    @app.after_request
+    def record_request(response):
+        if 'request_start' in g:
+            observe(f"request.{request.endpoint or 'unknown'}", time.perf_counter() - g.request_start)
+        if g.get('profile') is not None:
+            response.headers['Server-Timing'] = _server_timing(g.profile)
+        return response
+
+    def start_render(sender, template, context, **extra):
+        g.render_start = time.perf_counter()
+
+    def finish_render(sender, template, context, **extra):
+        if 'render_start' in g:
+            observe(f"render.{template.name}", time.perf_counter() - g.pop('render_start'))
+
+    before_render_template.connect(start_render, app, weak=False)
+    template_rendered.connect(finish_render, app, weak=False)
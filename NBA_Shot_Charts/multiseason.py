@@ -0,0 +1,138 @@
+import numpy as np
+
+from . import baselines, data, metrics, plotting, stats
+from .cache import DataCache
+
+# --- Constants ---
+CAREER = 'career'  # Season spec covering every season a player has shot data for
+RANGE_SEPARATOR = ':'  # Season spec for a range, e.g. '2015-16:2019-20'
+
+# --- Caching ---
+# Per-season aggregates keyed by (player_id, season_id, season_type): zone totals, league
+# totals and hexbins. They are additive, so a range is summed from these instead of being
+# recomputed over one concatenated DataFrame.
+_AGGREGATE_VERSION = 1  # Bump when the aggregate layout changes so old entries are ignored
+_aggregate_cache = DataCache('season_aggregates', max_memory_items=512)
+
+
+def is_multi_season(season_spec):
+    """True for 'career' and 'start:end' season specs, False for a single season ID."""
+    return season_spec == CAREER or RANGE_SEPARATOR in season_spec
+
+
+def range_spec(start_season_id, end_season_id):
+    """
+    Build a season spec from the two ends of a range, in either order.
+    Example: ('2019-20', '2015-16') returns '2015-16:2019-20', ('2019-20', '2019-20') returns '2019-20'
+    """
+    start, end = sorted([start_season_id, end_season_id])
+    return start if start == end else f"{start}{RANGE_SEPARATOR}{end}"
+
+
+def resolve_seasons(player_id, season_spec):
+    """
+    Expand a season spec into the seasons the player actually played.
+
+    Returns:
+        list: Season IDs, oldest first
+
+    Raises:
+        ValueError: If the spec is malformed or the player has no seasons in it.
+    """
+    seasons = sorted(data.get_player_career_seasons(player_id))
+    if season_spec == CAREER:
+        if not seasons:
+            raise ValueError(f"Player has no seasons from {data.EARLIEST_SEASON_YEAR} onwards")
+        return seasons
+
+    start, _, end = season_spec.partition(RANGE_SEPARATOR)
+    start_year, end_year = data.season_year_from_id(start), data.season_year_from_id(end)
+    if not start_year or not end_year:
+        raise ValueError(f"Invalid season range '{season_spec}'")
+    start_year, end_year = sorted([start_year, end_year])
+
+    in_range = [season for season in seasons if start_year <= data.season_year_from_id(season) <= end_year]
+    if not in_range:
+        raise ValueError(f"Player did not play between the {start} and {end} seasons")
+    return in_range
+
+
+def season_label(seasons):
+    """
+    Human-readable label for a list of seasons, oldest first.
+    Example: ['2015-16', '2016-17'] returns '2015-16 to 2016-17'
+    """
+    return seasons[0] if len(seasons) == 1 else f"{seasons[0]} to {seasons[-1]}"
+
+
+def _season_aggregate(shot_df, league_avg_df, season_id, season_type):
+    """Reduce one season's DataFrames to the additive pieces needed for stats and charts."""
+    empty = stats.empty_totals()
+    baseline = baselines.get_league_baseline(season_id, season_type, league_avg_df)
+    league = baseline['range'] if baseline else {'fgm': empty['fgm'], 'fga': empty['fga']}
+    if shot_df.empty:
+        no_shots = np.zeros(0, dtype=np.int64)
+        return {
+            'totals': empty,
+            'league': league,
+            'bins': {'q': no_shots, 'r': no_shots, 'attempts': no_shots, 'makes': no_shots}
+        }
+    return {
+        'totals': stats.aggregate_shots(shot_df),
+        'league': league,
+        'bins': plotting.bin_shots(shot_df)
+    }
+
+
+def get_season_aggregates(player_id, season_ids, season_type='Regular Season'):
+    """
+    Per-season aggregates for a player, computing only the seasons not already cached.
+    Missing seasons are fetched concurrently through the shared upstream pool.
+
+    Returns:
+        dict: season_id -> {'totals', 'league', 'bins'}, in the order of season_ids
+    """
+    aggregates = {}
+    missing = []
+    for season_id in season_ids:
+        aggregate = _aggregate_cache.get((_AGGREGATE_VERSION, int(player_id), season_id, season_type))
+        if aggregate is None:
+            missing.append(season_id)
+        else:
+            aggregates[season_id] = aggregate
+
+    if missing:
+        shot_data = data.get_player_shotchartdetails(
+            {season_id: (player_id, season_id) for season_id in missing}, season_type
+        )
+        for season_id, (shot_df, league_avg_df) in shot_data.items():
+            aggregate = _season_aggregate(shot_df, league_avg_df, season_id, season_type)
+            _aggregate_cache.set((_AGGREGATE_VERSION, int(player_id), season_id, season_type), aggregate,
+                                 ttl=data.season_ttl(season_id))
+            aggregates[season_id] = aggregate
+
+    return {season_id: aggregates[season_id] for season_id in season_ids}
+
+
+@metrics.timed('multiseason.summary')
+def get_multi_season_summary(player_id, season_spec, season_type='Regular Season'):
+    """
+    Stats and hexbins for a player across a season range or their whole career.
+
+    Returns:
+        dict with:
+            seasons: Season IDs covered, oldest first
+            summary: stats.summarize output for the merged totals
+            bins: plotting.merge_bins output for the merged shots
+    """
+    seasons = resolve_seasons(player_id, season_spec)
+    aggregates = list(get_season_aggregates(player_id, seasons, season_type).values())
+    league_totals = stats.merge_totals([aggregate['league'] for aggregate in aggregates])
+    return {
+        'seasons': seasons,
+        'summary': stats.summarize(
+            stats.merge_totals([aggregate['totals'] for aggregate in aggregates]),
+            league_totals if league_totals['fga'].any() else None
+        ),
+        'bins': plotting.merge_bins([aggregate['bins'] for aggregate in aggregates])
+    }
@@ -1,8 +1,35 @@
 import plotly.graph_objects as go
+import plotly.offline
 from plotly.subplots import make_subplots
 import numpy as np
+import pandas as pd
+import base64
+import os
 
-def draw_court():
+from . import metrics
+from .cache import DataCache
+
+# --- Rendered chart cache ---
+# Size-bounded LRU of finished chart HTML; set CHART_CACHE_DISK=1 to also keep charts on disk
+CHART_CACHE_MAX_BYTES = int(os.getenv('CHART_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+_chart_cache = DataCache(
+    'charts',
+    max_memory_items=1024,
+    max_memory_bytes=CHART_CACHE_MAX_BYTES,
+    persist=os.getenv('CHART_CACHE_DISK') == '1'
+)
+_PLOTTED_COLUMNS = ['LOC_X', 'LOC_Y', 'SHOT_MADE_FLAG', 'SHOT_DISTANCE', 'ACTION_TYPE']
+
+COURT_LINE_COLOR = "#2c3e50"
+
+def _arc_path(radius, theta, y_offset=0, mirror=False):
+    """Format a circular arc as an SVG path in one vectorized pass."""
+    x = radius * np.cos(theta) * (-1 if mirror else 1)
+    y = radius * np.sin(theta) + y_offset
+    points = np.char.add(np.char.add(np.char.mod('%.2f', x), ','), np.char.mod('%.2f', y))
+    return 'M ' + ' L '.join(points)
+
+def _build_court_shapes():
     """Generate NBA court lines as Plotly shapes."""
     shapes = []
     
@@ -10,7 +37,7 @@ def draw_court():
     shapes.append(dict(
         type="rect",
         x0=-250, y0=-47.5, x1=250, y1=422.5,
-        line=dict(color="#2c3e50", width=3),
+        line=dict(color=COURT_LINE_COLOR, width=3),
         fillcolor="rgba(0,0,0,0)"
     ))
     
@@ -18,7 +45,7 @@ def draw_court():
     shapes.append(dict(
         type="circle",
         x0=-7.5, y0=-7.5, x1=7.5, y1=7.5,
-        line=dict(color="#2c3e50", width=2),
+        line=dict(color=COURT_LINE_COLOR, width=2),
         fillcolor="rgba(0,0,0,0)"
     ))
     
@@ -26,14 +53,14 @@ def draw_court():
     shapes.append(dict(
         type="line",
         x0=-30, y0=-12.5, x1=30, y1=-12.5,
-        line=dict(color="#2c3e50", width=3)
+        line=dict(color=COURT_LINE_COLOR, width=3)
     ))
     
     # Paint (outer box)
     shapes.append(dict(
         type="rect",
         x0=-80, y0=-47.5, x1=80, y1=142.5,
-        line=dict(color="#2c3e50", width=2),
+        line=dict(color=COURT_LINE_COLOR, width=2),
         fillcolor="rgba(0,0,0,0)"
     ))
     
@@ -41,70 +68,74 @@ def draw_court():
     shapes.append(dict(
         type="rect",
         x0=-60, y0=-47.5, x1=60, y1=142.5,
-        line=dict(color="#2c3e50", width=2),
+        line=dict(color=COURT_LINE_COLOR, width=2),
         fillcolor="rgba(0,0,0,0)"
     ))
     
     # Free throw circle (top arc)
     theta = np.linspace(0, np.pi, 50)
-    x_ft = 60 * np.cos(theta)
-    y_ft = 60 * np.sin(theta) + 142.5
     shapes.append(dict(
         type="path",
-        path=f"M {x_ft[0]},{y_ft[0]} " + " ".join([f"L {x},{y}" for x, y in zip(x_ft[1:], y_ft[1:])]),
-        line=dict(color="#2c3e50", width=2)
+        path=_arc_path(60, theta, y_offset=142.5),
+        line=dict(color=COURT_LINE_COLOR, width=2)
     ))
     
     # Free throw circle (bottom arc - dashed)
     shapes.append(dict(
         type="path",
-        path=f"M {-x_ft[0]},{y_ft[0]} " + " ".join([f"L {-x},{y}" for x, y in zip(x_ft[1:], y_ft[1:])]),
-        line=dict(color="#2c3e50", width=2, dash="dash")
+        path=_arc_path(60, theta, y_offset=142.5, mirror=True),
+        line=dict(color=COURT_LINE_COLOR, width=2, dash="dash")
     ))
     
     # Restricted area
-    theta_rest = np.linspace(0, np.pi, 50)
-    x_rest = 40 * np.cos(theta_rest)
-    y_rest = 40 * np.sin(theta_rest)
     shapes.append(dict(
         type="path",
-        path=f"M {x_rest[0]},{y_rest[0]} " + " ".join([f"L {x},{y}" for x, y in zip(x_rest[1:], y_rest[1:])]),
-        line=dict(color="#2c3e50", width=2)
+        path=_arc_path(40, theta),
+        line=dict(color=COURT_LINE_COLOR, width=2)
     ))
     
     # Three-point line (arc)
     theta_3pt = np.linspace(0.395, np.pi - 0.395, 100)
-    x_3pt = 237.5 * np.cos(theta_3pt)
-    y_3pt = 237.5 * np.sin(theta_3pt)
     shapes.append(dict(
         type="path",
-        path=f"M {x_3pt[0]},{y_3pt[0]} " + " ".join([f"L {x},{y}" for x, y in zip(x_3pt[1:], y_3pt[1:])]),
-        line=dict(color="#2c3e50", width=2)
+        path=_arc_path(237.5, theta_3pt),
+        line=dict(color=COURT_LINE_COLOR, width=2)
     ))
     
     # Three-point line (corners)
     shapes.append(dict(
         type="line",
         x0=-220, y0=-47.5, x1=-220, y1=92.5,
-        line=dict(color="#2c3e50", width=2)
+        line=dict(color=COURT_LINE_COLOR, width=2)
     ))
     shapes.append(dict(
         type="line",
         x0=220, y0=-47.5, x1=220, y1=92.5,
-        line=dict(color="#2c3e50", width=2)
+        line=dict(color=COURT_LINE_COLOR, width=2)
     ))
     
     # Center court
     shapes.append(dict(
         type="circle",
         x0=-60, y0=362.5, x1=60, y1=482.5,
-        line=dict(color="#2c3e50", width=2),
+        line=dict(color=COURT_LINE_COLOR, width=2),
         fillcolor="rgba(0,0,0,0)"
     ))
     
-    return shapes
+    return tuple(shapes)
+
+# The court never changes, so its shapes are built once at import and shared by every figure
+COURT_SHAPES = _build_court_shapes()
+
+def draw_court():
+    """Return the precomputed NBA court lines as Plotly shapes."""
+    return list(COURT_SHAPES)
 
-def draw_plot(player_shotchart_df, title, div_id='shot-chart', include_plotlyjs='cdn'):
+def _data_version(player_shotchart_df):
+    """Fingerprint of the plotted columns, so a chart is re-rendered whenever its shots change."""
+    return int(pd.util.hash_pandas_object(player_shotchart_df[_PLOTTED_COLUMNS], index=False).sum())
+
+def draw_plot(player_shotchart_df, title, div_id='shot-chart', include_plotlyjs='cdn', cache_key=None, mode='scatter'):
     """Generate interactive shot chart using Plotly and return as HTML div.
     
     Args:
@@ -112,16 +143,272 @@ def draw_plot(player_shotchart_df, title, div_id='shot-chart', include_plotlyjs=
         title: Chart title
         div_id: Unique div ID for the chart (default: 'shot-chart')
         include_plotlyjs: How to include Plotly JS ('cdn', True, False) - use 'cdn' for first chart, False for subsequent
+        cache_key: Optional (player_id, season_id) tuple; when given, the rendered HTML is cached
+        mode: 'scatter' for one marker per shot, 'density' for hexagonal bins colored by FG%
+    """
+    if cache_key is None:
+        return _render_mode(player_shotchart_df, title, div_id, include_plotlyjs, mode)
+
+    full_key = (*cache_key, div_id, include_plotlyjs, title, mode, _data_version(player_shotchart_df))
+    chart_html = _chart_cache.get(full_key)
+    if chart_html is None:
+        chart_html = _render_mode(player_shotchart_df, title, div_id, include_plotlyjs, mode)
+        _chart_cache.set(full_key, chart_html)
+    return chart_html
+
+def _render_mode(player_shotchart_df, title, div_id, include_plotlyjs, mode):
+    if mode == 'density':
+        made_shots = int(player_shotchart_df['SHOT_MADE_FLAG'].sum())
+        return draw_density(bin_shots(player_shotchart_df), title, made_shots, len(player_shotchart_df),
+                            div_id, include_plotlyjs)
+    return _render_plot(player_shotchart_df, title, div_id, include_plotlyjs)
+
+# Same script plotly.py links for include_plotlyjs='cdn', for pages that draw charts in the browser
+PLOTLYJS_CDN_URL = f"https://cdn.plot.ly/plotly-{plotly.offline.get_plotlyjs_version()}.min.js"
+
+# --- Shared chart styling ---
+# Used both for server-rendered HTML and, via chart_template(), for charts drawn in the browser
+_HOVER_TEMPLATE = ('Distance: %{customdata[0]} ft<br>' +
+                   'Shot Type: %{customdata[1]}<br>' +
+                   '<extra></extra>')
+
+MISSED_TRACE_STYLE = dict(
+    mode='markers',
+    name='Missed',
+    marker=dict(
+        symbol='x',
+        size=8,
+        color='#e74c3c',
+        line=dict(width=2, color='#e74c3c'),
+        opacity=0.6
+    ),
+    hovertemplate='<b>Missed Shot</b><br>' + _HOVER_TEMPLATE
+)
+
+MADE_TRACE_STYLE = dict(
+    mode='markers',
+    name='Made',
+    marker=dict(
+        symbol='circle',
+        size=8,
+        color='rgba(39, 174, 96, 0)',
+        line=dict(width=2.5, color='#27ae60'),
+        opacity=0.8
+    ),
+    hovertemplate='<b>Made Shot</b><br>' + _HOVER_TEMPLATE
+)
+
+TITLE_STYLE = dict(
+    font=dict(size=22, color='#1a1a1a', family='Arial, sans-serif'),
+    x=0.5,
+    xanchor='center'
+)
+
+CHART_LAYOUT = dict(
+    xaxis=dict(
+        range=[-250, 250],
+        showgrid=False,
+        showticklabels=False,
+        zeroline=False,
+    ),
+    yaxis=dict(
+        range=[-47.5, 422.5],
+        showgrid=False,
+        showticklabels=False,
+        zeroline=False,
+        scaleanchor="x",
+        scaleratio=1
+    ),
+    shapes=list(COURT_SHAPES),
+    plot_bgcolor='#f5f5f5',
+    paper_bgcolor='white',
+    height=700,
+    width=650,
+    showlegend=True,
+    legend=dict(
+        x=0.85,
+        y=0.98,
+        bgcolor='rgba(255,255,255,0.9)',
+        bordercolor='#2c3e50',
+        borderwidth=2,
+        font=dict(size=12)
+    ),
+    hovermode='closest',
+    margin=dict(l=20, r=20, t=80, b=20)
+)
+
+DENSITY_TRACE_STYLE = dict(
+    mode='markers',
+    name='FG% by area',
+    showlegend=False,
+    marker=dict(
+        symbol='hexagon',
+        colorscale='RdYlGn',
+        cmin=0.2,
+        cmax=0.7,
+        line=dict(width=0.5, color='white'),
+        opacity=0.9,
+        colorbar=dict(title='FG%', tickformat='.0%', thickness=12, len=0.5, y=0.75)
+    ),
+    hovertemplate='<b>FG%: %{customdata[2]:.1f}%</b><br>' +
+                  'Made: %{customdata[1]} of %{customdata[0]}<br>' +
+                  '<extra></extra>'
+)
+
+# --- Density mode ---
+HEX_SIZE = 12  # Hexagon radius in court units (tenths of a foot)
+DENSITY_MAX_MARKER_SIZE = 18  # Marker size in pixels for the busiest hexagon
+DENSITY_MIN_MARKER_SIZE = 4
+_HEX_KEY_OFFSET = 1 << 20
+_HEX_KEY_SPAN = 1 << 21
+
+CHART_CONFIG = {
+    'displayModeBar': True,
+    'displaylogo': False,
+    'modeBarButtonsToRemove': ['select2d', 'lasso2d'],
+    'toImageButtonOptions': {
+        'format': 'png',
+        'filename': 'shot_chart',
+        'height': 700,
+        'width': 650,
+        'scale': 2
+    }
+}
+
+def chart_title(title, made_shots, total_shots):
+    """Chart title with the FG% subtitle."""
+    fg_pct = (made_shots / total_shots * 100) if total_shots > 0 else 0
+    return f"{title}<br><sub>FG%: {fg_pct:.1f}% ({made_shots}/{total_shots})</sub>"
+
+def chart_template():
+    """
+    Everything about a shot chart except the shots themselves, for rendering in the browser.
+
+    Returns:
+        dict: {'layout', 'title_style', 'traces': {'missed', 'made', 'density'}, 'config'}
+    """
+    return {
+        'layout': CHART_LAYOUT,
+        'title_style': TITLE_STYLE,
+        'traces': {'missed': MISSED_TRACE_STYLE, 'made': MADE_TRACE_STYLE, 'density': DENSITY_TRACE_STYLE},
+        'config': CHART_CONFIG
+    }
+
+@metrics.timed('plotting.bin_shots')
+def bin_shots(player_shotchart_df, hex_size=HEX_SIZE):
+    """
+    Group shots into hexagonal bins in one vectorized pass.
+
+    Bins use axial (q, r) coordinates on a pointy-top hex grid, so results for
+    different seasons can be merged by adding counts for matching keys.
+
+    Returns:
+        dict: {'q', 'r', 'attempts', 'makes'} arrays with one entry per non-empty bin
     """
+    x = player_shotchart_df['LOC_X'].to_numpy(dtype=np.float64)
+    y = player_shotchart_df['LOC_Y'].to_numpy(dtype=np.float64)
+    made = player_shotchart_df['SHOT_MADE_FLAG'].to_numpy(dtype=bool)
+
+    # Fractional axial coordinates, rounded to the nearest hexagon via cube coordinates
+    q_frac = (np.sqrt(3) / 3 * x - y / 3) / hex_size
+    r_frac = (2 / 3 * y) / hex_size
+    s_frac = -q_frac - r_frac
+    q, r, s_round = np.round(q_frac), np.round(r_frac), np.round(s_frac)
+    q_diff, r_diff, s_diff = np.abs(q - q_frac), np.abs(r - r_frac), np.abs(s_round - s_frac)
+    fix_q = (q_diff > r_diff) & (q_diff > s_diff)
+    fix_r = ~fix_q & (r_diff > s_diff)
+    q = np.where(fix_q, -r - s_round, q).astype(np.int64)
+    r = np.where(fix_r, -q - s_round, r).astype(np.int64)
+
+    # Pack (q, r) into one integer so np.unique works on a flat array
+    keys, inverse = np.unique((q + _HEX_KEY_OFFSET) * _HEX_KEY_SPAN + (r + _HEX_KEY_OFFSET), return_inverse=True)
+    return {
+        'q': keys // _HEX_KEY_SPAN - _HEX_KEY_OFFSET,
+        'r': keys % _HEX_KEY_SPAN - _HEX_KEY_OFFSET,
+        'attempts': np.bincount(inverse, minlength=len(keys)),
+        'makes': np.bincount(inverse, weights=made, minlength=len(keys)).astype(np.int64)
+    }
+
+def merge_bins(bins_list):
+    """
+    Combine hexbin results (e.g. one per season) by adding counts for matching hexagons.
+
+    Returns:
+        dict: {'q', 'r', 'attempts', 'makes'} arrays, like bin_shots
+    """
+    q = np.concatenate([bins['q'] for bins in bins_list]).astype(np.int64)
+    r = np.concatenate([bins['r'] for bins in bins_list]).astype(np.int64)
+    keys, inverse = np.unique((q + _HEX_KEY_OFFSET) * _HEX_KEY_SPAN + (r + _HEX_KEY_OFFSET), return_inverse=True)
+    attempts = np.concatenate([bins['attempts'] for bins in bins_list])
+    makes = np.concatenate([bins['makes'] for bins in bins_list])
+    return {
+        'q': keys // _HEX_KEY_SPAN - _HEX_KEY_OFFSET,
+        'r': keys % _HEX_KEY_SPAN - _HEX_KEY_OFFSET,
+        'attempts': np.bincount(inverse, weights=attempts, minlength=len(keys)).astype(np.int64),
+        'makes': np.bincount(inverse, weights=makes, minlength=len(keys)).astype(np.int64)
+    }
+
+def _density_points(bins, hex_size=HEX_SIZE):
+    """Centers, marker sizes and FG% for each hexagonal bin."""
+    attempts, makes = bins['attempts'], bins['makes']
+    x = hex_size * np.sqrt(3) * (bins['q'] + bins['r'] / 2)
+    y = hex_size * 1.5 * bins['r']
+    fg_pct = np.divide(makes, attempts, out=np.zeros(len(attempts)), where=attempts > 0)
+    max_attempts = attempts.max() if len(attempts) else 1
+    size = np.maximum(DENSITY_MAX_MARKER_SIZE * np.sqrt(attempts / max_attempts), DENSITY_MIN_MARKER_SIZE)
+    return x, y, size, fg_pct
+
+@metrics.timed('plotting.render_density')
+def draw_density(bins, title, made_shots, total_shots, div_id='shot-chart', include_plotlyjs='cdn'):
+    """Build a hexbin density chart from bin_shots (or merge_bins) output and return it as an HTML div."""
+    x, y, size, fg_pct = _density_points(bins)
+
+    fig = go.Figure(go.Scatter(
+        x=x,
+        y=y,
+        customdata=np.column_stack((bins['attempts'], bins['makes'], fg_pct * 100)),
+        **DENSITY_TRACE_STYLE
+    ))
+    fig.update_traces(marker=dict(size=size, color=fg_pct))
+    fig.update_layout(
+        title=dict(text=chart_title(title, made_shots, total_shots), **TITLE_STYLE),
+        **CHART_LAYOUT
+    )
+    return fig.to_html(
+        include_plotlyjs=include_plotlyjs,
+        div_id=div_id,
+        config=CHART_CONFIG
+    )
+
+def build_density_spec(bins, made_shots, total_shots):
+    """
+    Render-ready hexbin data for drawing in the browser.
+    Its size depends on the number of occupied hexagons, not the number of shots.
+
+    Returns:
+        dict: {'mode', 'count', 'made_shots', 'x', 'y', 'size', 'fg_pct', 'attempts', 'makes'}
+    """
+    x, y, size, fg_pct = _density_points(bins)
+    return {
+        'mode': 'density',
+        'count': int(total_shots),
+        'made_shots': int(made_shots),
+        'x': np.round(x, 1).tolist(),
+        'y': np.round(y, 1).tolist(),
+        'size': np.round(size, 1).tolist(),
+        'fg_pct': np.round(fg_pct, 3).tolist(),
+        'attempts': bins['attempts'].tolist(),
+        'makes': bins['makes'].tolist()
+    }
+
+@metrics.timed('plotting.render_scatter')
+def _render_plot(player_shotchart_df, title, div_id, include_plotlyjs):
+    """Build the Plotly figure for a shot chart and serialize it to HTML."""
     
     # Separate made and missed shots
-    missed = player_shotchart_df[player_shotchart_df['EVENT_TYPE'] == 'Missed Shot']
-    made = player_shotchart_df[player_shotchart_df['EVENT_TYPE'] == 'Made Shot']
-    
-    # Calculate stats
-    total_shots = len(player_shotchart_df)
-    made_shots = len(made)
-    fg_pct = (made_shots / total_shots * 100) if total_shots > 0 else 0
+    made_mask = player_shotchart_df['SHOT_MADE_FLAG'].to_numpy(dtype=bool)
+    missed = player_shotchart_df[~made_mask]
+    made = player_shotchart_df[made_mask]
     
     # Create figure
     fig = go.Figure()
@@ -130,102 +417,66 @@ def draw_plot(player_shotchart_df, title, div_id='shot-chart', include_plotlyjs=
     fig.add_trace(go.Scatter(
         x=missed['LOC_X'],
         y=missed['LOC_Y'],
-        mode='markers',
-        name='Missed',
-        marker=dict(
-            symbol='x',
-            size=8,
-            color='#e74c3c',
-            line=dict(width=2, color='#e74c3c'),
-            opacity=0.6
-        ),
-        hovertemplate='<b>Missed Shot</b><br>' +
-                      'Distance: %{customdata[0]} ft<br>' +
-                      'Shot Type: %{customdata[1]}<br>' +
-                      '<extra></extra>',
         customdata=np.column_stack((
             missed['SHOT_DISTANCE'].values,
             missed['ACTION_TYPE'].values
-        ))
+        )),
+        **MISSED_TRACE_STYLE
     ))
     
     # Add made shots
     fig.add_trace(go.Scatter(
         x=made['LOC_X'],
         y=made['LOC_Y'],
-        mode='markers',
-        name='Made',
-        marker=dict(
-            symbol='circle',
-            size=8,
-            color='rgba(39, 174, 96, 0)',
-            line=dict(width=2.5, color='#27ae60'),
-            opacity=0.8
-        ),
-        hovertemplate='<b>Made Shot</b><br>' +
-                      'Distance: %{customdata[0]} ft<br>' +
-                      'Shot Type: %{customdata[1]}<br>' +
-                      '<extra></extra>',
         customdata=np.column_stack((
             made['SHOT_DISTANCE'].values,
             made['ACTION_TYPE'].values
-        ))
+        )),
+        **MADE_TRACE_STYLE
     ))
     
     # Update layout
     fig.update_layout(
-        title=dict(
-            text=f"{title}<br><sub>FG%: {fg_pct:.1f}% ({made_shots}/{total_shots})</sub>",
-            font=dict(size=22, color='#1a1a1a', family='Arial, sans-serif'),
-            x=0.5,
-            xanchor='center'
-        ),
-        xaxis=dict(
-            range=[-250, 250],
-            showgrid=False,
-            showticklabels=False,
-            zeroline=False,
-        ),
-        yaxis=dict(
-            range=[-47.5, 422.5],
-            showgrid=False,
-            showticklabels=False,
-            zeroline=False,
-            scaleanchor="x",
-            scaleratio=1
-        ),
-        shapes=draw_court(),
-        plot_bgcolor='#f5f5f5',
-        paper_bgcolor='white',
-        height=700,
-        width=650,
-        showlegend=True,
-        legend=dict(
-            x=0.85,
-            y=0.98,
-            bgcolor='rgba(255,255,255,0.9)',
-            bordercolor='#2c3e50',
-            borderwidth=2,
-            font=dict(size=12)
-        ),
-        hovermode='closest',
-        margin=dict(l=20, r=20, t=80, b=20)
+        title=dict(text=chart_title(title, len(made), len(player_shotchart_df)), **TITLE_STYLE),
+        **CHART_LAYOUT
     )
     
     # Return as HTML div
     return fig.to_html(
         include_plotlyjs=include_plotlyjs,
         div_id=div_id,
-        config={
-            'displayModeBar': True,
-            'displaylogo': False,
-            'modeBarButtonsToRemove': ['select2d', 'lasso2d'],
-            'toImageButtonOptions': {
-                'format': 'png',
-                'filename': 'shot_chart',
-                'height': 700,
-                'width': 650,
-                'scale': 2
-            }
-        }
-    )
\ No newline at end of file
+        config=CHART_CONFIG
+    )
+
+def _encode(array, dtype):
+    """Pack a numeric array as little-endian bytes in base64."""
+    return base64.b64encode(np.ascontiguousarray(array, dtype=dtype).tobytes()).decode('ascii')
+
+@metrics.timed('plotting.chart_spec')
+def build_chart_spec(player_shotchart_df):
+    """
+    Compact, render-ready description of a player's shots for drawing in the browser.
+
+    Coordinates are int16, distances uint8, the made flag a little-endian bitmask and
+    action types codes into the 'action_types' list. Each array is base64 encoded.
+
+    Returns:
+        dict: {'mode', 'count', 'made_shots', 'loc_x', 'loc_y', 'distance', 'made', 'action_type',
+               'action_type_dtype', 'action_types'}
+    """
+    made = player_shotchart_df['SHOT_MADE_FLAG'].to_numpy(dtype=bool)
+    action_codes, action_types = pd.factorize(player_shotchart_df['ACTION_TYPE'], sort=True)
+    action_dtype = '<u1' if len(action_types) <= 256 else '<u2'
+
+    return {
+        'mode': 'scatter',
+        'count': len(player_shotchart_df),
+        'made_shots': int(made.sum()),
+        'loc_x': _encode(player_shotchart_df['LOC_X'], '<i2'),
+        'loc_y': _encode(player_shotchart_df['LOC_Y'], '<i2'),
+        'distance': _encode(np.clip(player_shotchart_df['SHOT_DISTANCE'], 0, 255), '<u1'),
+        'made': base64.b64encode(np.packbits(made, bitorder='little').tobytes()).decode('ascii'),
+        'action_type': _encode(action_codes, action_dtype),
+        'action_type_dtype': 'uint8' if action_dtype == '<u1' else 'uint16',
+        'action_types': [str(action_type) for action_type in action_types]
+    }
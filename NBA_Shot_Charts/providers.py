@@ -0,0 +1,211 @@
+import json
+import os
+
+import pandas as pd
+
+# --- Configuration ---
+DATA_PROVIDER = os.getenv('NBA_DATA_PROVIDER', 'nba_api')  # 'nba_api' or 'local'
+FIXTURES_DIR = os.getenv('NBA_FIXTURES_DIR', 'fixtures')
+UPSTREAM_TIMEOUT = float(os.getenv('UPSTREAM_TIMEOUT', 10))  # Seconds before one stats.nba.com request is abandoned
+
+
+class DataProvider:
+    """
+    Interface for the upstream NBA data used by the app.
+    All DataFrames use the column names returned by the stats.nba.com endpoints.
+
+    Providers with remote=True call a network service, and their calls go through the
+    rate limit, retries and circuit breaker in resilience.py.
+    """
+
+    remote = False
+
+    def get_players(self):
+        """
+        Returns:
+            list: Player dicts with id, full_name, first_name, last_name and is_active.
+        """
+        raise NotImplementedError
+
+    def get_player_career(self, player_id):
+        """
+        Returns:
+            DataFrame: The SeasonTotalsRegularSeason table from PlayerCareerStats.
+        """
+        raise NotImplementedError
+
+    def get_shot_chart(self, player_id, team_id, season_id, season_type='Regular Season'):
+        """
+        Returns:
+            tuple: (shot_df, league_avg_df) from ShotChartDetail. team_id=0 means every team.
+        """
+        raise NotImplementedError
+
+    def get_season_players(self, season_id, season_type='Regular Season'):
+        """
+        Returns:
+            DataFrame: One row per player who played in the season, with PLAYER_ID and TEAM_ID.
+        """
+        raise NotImplementedError
+
+
+class NBAApiProvider(DataProvider):
+    """Live provider backed by nba_api and stats.nba.com."""
+
+    remote = True
+
+    def get_players(self):
+        from nba_api.stats.static import players
+        return players.get_players()
+
+    def get_player_career(self, player_id):
+        from nba_api.stats.endpoints import playercareerstats
+        return playercareerstats.PlayerCareerStats(player_id=player_id, timeout=UPSTREAM_TIMEOUT).get_data_frames()[0]
+
+    def get_shot_chart(self, player_id, team_id, season_id, season_type='Regular Season'):
+        from nba_api.stats.endpoints import shotchartdetail
+        shotchartlist = shotchartdetail.ShotChartDetail(
+            team_id=int(team_id),
+            player_id=int(player_id),
+            season_type_all_star=season_type,
+            season_nullable=season_id,
+            context_measure_simple='FGA',
+            timeout=UPSTREAM_TIMEOUT
+        ).get_data_frames()
+        return shotchartlist[0], shotchartlist[1]
+
+    def get_season_players(self, season_id, season_type='Regular Season'):
+        from nba_api.stats.endpoints import leaguedashplayerstats
+        return leaguedashplayerstats.LeagueDashPlayerStats(
+            season=season_id,
+            season_type_all_star=season_type,
+            timeout=UPSTREAM_TIMEOUT
+        ).get_data_frames()[0]
+
+
+def _season_type_slug(season_type):
+    return season_type.lower().replace(' ', '_')
+
+
+def _fixture_paths(fixtures_dir):
+    """Map each kind of recorded response to its path builder."""
+    return {
+        'players': lambda: os.path.join(fixtures_dir, 'players.json'),
+        'career': lambda player_id: os.path.join(fixtures_dir, 'careers', f"{int(player_id)}.json"),
+        'shot_chart': lambda player_id, team_id, season_id, season_type: os.path.join(
+            fixtures_dir, 'shotcharts', _season_type_slug(season_type), season_id, f"{int(player_id)}_{int(team_id)}.json"
+        ),
+        'season_players': lambda season_id, season_type: os.path.join(
+            fixtures_dir, 'season_players', _season_type_slug(season_type), f"{season_id}.json"
+        ),
+    }
+
+
+def _read_frame(payload):
+    # Built the same way nba_api builds its frames, so dtypes match the live responses
+    return pd.DataFrame(payload['data'], columns=payload['columns'])
+
+
+def _dump_frame(df):
+    return {'columns': df.columns.tolist(), 'data': json.loads(df.to_json(orient='values'))}
+
+
+class LocalProvider(DataProvider):
+    """
+    Offline provider that replays responses recorded on disk by RecordingProvider.
+
+    Layout under fixtures_dir:
+        players.json
+        careers/<player_id>.json
+        shotcharts/<season_type>/<season_id>/<player_id>_<team_id>.json
+        season_players/<season_type>/<season_id>.json
+    """
+
+    def __init__(self, fixtures_dir=None):
+        self.fixtures_dir = fixtures_dir or FIXTURES_DIR
+        self._paths = _fixture_paths(self.fixtures_dir)
+
+    def _load(self, path):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No recorded response at {path}")
+        with open(path) as f:
+            return json.load(f)
+
+    def get_players(self):
+        return self._load(self._paths['players']())
+
+    def get_player_career(self, player_id):
+        return _read_frame(self._load(self._paths['career'](player_id)))
+
+    def get_shot_chart(self, player_id, team_id, season_id, season_type='Regular Season'):
+        payload = self._load(self._paths['shot_chart'](player_id, team_id, season_id, season_type))
+        return _read_frame(payload['shots']), _read_frame(payload['league_averages'])
+
+    def get_season_players(self, season_id, season_type='Regular Season'):
+        return _read_frame(self._load(self._paths['season_players'](season_id, season_type)))
+
+
+class RecordingProvider(DataProvider):
+    """Wraps another provider and saves every response in the layout LocalProvider reads."""
+
+    def __init__(self, inner, fixtures_dir=None):
+        self.inner = inner
+        self.remote = inner.remote
+        self.fixtures_dir = fixtures_dir or FIXTURES_DIR
+        self._paths = _fixture_paths(self.fixtures_dir)
+
+    def _save(self, path, payload):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(payload, f)
+
+    def get_players(self):
+        result = self.inner.get_players()
+        self._save(self._paths['players'](), result)
+        return result
+
+    def get_player_career(self, player_id):
+        result = self.inner.get_player_career(player_id)
+        self._save(self._paths['career'](player_id), _dump_frame(result))
+        return result
+
+    def get_shot_chart(self, player_id, team_id, season_id, season_type='Regular Season'):
+        shot_df, league_avg_df = self.inner.get_shot_chart(player_id, team_id, season_id, season_type)
+        self._save(
+            self._paths['shot_chart'](player_id, team_id, season_id, season_type),
+            {'shots': _dump_frame(shot_df), 'league_averages': _dump_frame(league_avg_df)}
+        )
+        return shot_df, league_avg_df
+
+    def get_season_players(self, season_id, season_type='Regular Season'):
+        result = self.inner.get_season_players(season_id, season_type)
+        self._save(self._paths['season_players'](season_id, season_type), _dump_frame(result))
+        return result
+
+
+# --- Active provider ---
+_provider = None
+
+
+def get_provider():
+    """
+    Returns the active data provider, creating it from NBA_DATA_PROVIDER on first use.
+    Set NBA_RECORD_FIXTURES=1 to record live responses into NBA_FIXTURES_DIR.
+    """
+    global _provider
+    if _provider is None:
+        if DATA_PROVIDER == 'local':
+            _provider = LocalProvider()
+        elif DATA_PROVIDER == 'nba_api':
+            _provider = NBAApiProvider()
+            if os.getenv('NBA_RECORD_FIXTURES') == '1':
+                _provider = RecordingProvider(_provider)
+        else:
+            raise ValueError(f"Unknown NBA_DATA_PROVIDER '{DATA_PROVIDER}'. Use 'nba_api' or 'local'.")
+    return _provider
+
+
+def set_provider(provider):
+    """Replace the active data provider (e.g. with a LocalProvider for benchmarks)."""
+    global _provider
+    _provider = provider
@@ -0,0 +1,216 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+import random
+import threading
+import time
+
+try:
+    import requests  # Installed with nba_api; only used to recognise transport errors
+except ImportError:
+    requests = None
+
+# --- Configuration ---
+UPSTREAM_RATE = float(os.getenv('UPSTREAM_RATE', 2))  # Sustained upstream requests per second per process
+UPSTREAM_BURST = int(os.getenv('UPSTREAM_BURST', 5))  # Requests allowed back to back before the rate applies
+UPSTREAM_RATE_WAIT = float(os.getenv('UPSTREAM_RATE_WAIT', 2))  # Seconds to wait for a request slot before giving up
+UPSTREAM_RETRIES = int(os.getenv('UPSTREAM_RETRIES', 2))  # Retries after a failed upstream call
+UPSTREAM_BACKOFF = float(os.getenv('UPSTREAM_BACKOFF', 0.5))  # Base seconds for jittered exponential backoff
+UPSTREAM_DEADLINE = float(os.getenv('UPSTREAM_DEADLINE', 20))  # No retry starts after this many seconds in total
+BREAKER_FAILURES = int(os.getenv('BREAKER_FAILURES', 5))  # Consecutive failed calls (after retries) that open the circuit
+BREAKER_RESET = float(os.getenv('BREAKER_RESET', 30))  # Seconds the circuit stays open before a trial call
+
+
+class UpstreamUnavailableError(Exception):
+    """Raised without calling upstream when the circuit is open or no request slot frees up in time."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, holding at most `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout):
+        """
+        Take one token, waiting up to timeout seconds for it.
+        Waiting callers reserve their token up front, so they are served in arrival order.
+
+        Returns:
+            bool: True if a token was taken.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = (1 - self._tokens) / self.rate if self._tokens < 1 else 0
+            if wait > timeout:
+                return False
+            self._tokens -= 1
+        if wait:
+            time.sleep(wait)
+        return True
+
+
+class CircuitBreaker:
+    """
+    Stop calling a failing upstream for a while.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls are
+    refused for `reset_timeout` seconds. Then one trial call is let through
+    (half-open): success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return 'open'
+            return 'half-open'
+
+    def allow(self):
+        """True if a call may go out now."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_running:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+
+# --- Shared upstream guards ---
+# Every provider call goes to the same upstream (stats.nba.com), so they share one
+# rate limit and one circuit.
+_bucket = TokenBucket(UPSTREAM_RATE, UPSTREAM_BURST)
+_breaker = CircuitBreaker(BREAKER_FAILURES, BREAKER_RESET)
+
+
+def upstream_state():
+    """Returns the shared circuit's state: 'closed', 'open' or 'half-open'."""
+    return _breaker.state
+
+
+def is_transient(error):
+    """
+    True for failures worth retrying and counting against the circuit: timeouts,
+    dropped connections and HTTP 429/5xx responses. Anything else (bad IDs, missing
+    data, parse errors) is the caller's problem and is raised straight away.
+    """
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    if requests is None:
+        return False
+    if isinstance(error, (requests.Timeout, requests.ConnectionError)):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return False
+
+
+def batch_rate_wait(count):
+    """
+    Seconds each call of a batch of count concurrent calls may wait for a request slot,
+    enough for the whole batch to get through at UPSTREAM_RATE.
+    """
+    return UPSTREAM_RATE_WAIT + max(count - UPSTREAM_BURST, 0) / UPSTREAM_RATE
+
+
+def call(fn, *args, rate_wait=None):
+    """
+    Call fn(*args) against the upstream with rate limiting, jittered retries and the circuit breaker.
+
+    Args:
+        rate_wait: Seconds to wait for a request slot (default UPSTREAM_RATE_WAIT); batch
+                   callers pass batch_rate_wait(len(batch)) so later calls can queue
+
+    Raises:
+        UpstreamUnavailableError: If the circuit is open or no request slot is free within rate_wait.
+        The last exception from fn once retries or UPSTREAM_DEADLINE are used up.
+        Non-transient exceptions from fn (see is_transient) at once, without retrying.
+    """
+    if rate_wait is None:
+        rate_wait = UPSTREAM_RATE_WAIT
+    start = time.monotonic()
+    # Wait for a request slot first, so a half-open trial call is never left waiting
+    if not _bucket.acquire(rate_wait):
+        raise UpstreamUnavailableError('Too many requests to the NBA stats service')
+    if not _breaker.allow():
+        raise UpstreamUnavailableError('NBA stats service is temporarily unavailable')
+
+    # The breaker counts logical calls: one failure once the retries are used up
+    for attempt in range(UPSTREAM_RETRIES + 1):
+        try:
+            result = fn(*args)
+        except Exception as e:
+            if not is_transient(e):
+                # The upstream answered; the error is about this request, not the service
+                _breaker.record_success()
+                raise
+            # Full jitter: sleep a random fraction of the exponential backoff
+            backoff = random.uniform(0, UPSTREAM_BACKOFF * 2 ** attempt)
+            if attempt == UPSTREAM_RETRIES or time.monotonic() - start + backoff > UPSTREAM_DEADLINE:
+                _breaker.record_failure()
+                raise
+            time.sleep(backoff)
+            # Retries need a request slot too; without one the call has failed
+            if not _bucket.acquire(rate_wait):
+                _breaker.record_failure()
+                raise
+        else:
+            _breaker.record_success()
+            return result
+
+
+# --- Stale-while-revalidate ---
+_refresh_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='refresh')
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+def refresh_in_background(key, fn, *args):
+    """
+    Run fn(*args) in the background to refresh a stale cache entry, once per key at a time.
+    Failures are logged and leave the stale entry in place.
+    """
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def refresh():
+        try:
+            fn(*args)
+        except Exception as e:
+            print(f"Background refresh of {key} failed: {e}")
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+
+    _refresh_pool.submit(refresh)
@@ -0,0 +1,57 @@
+import gzip
+import hashlib
+
+from flask import Response, request
+
+try:
+    import brotli  # Optional: only used to serve a brotli variant when installed
+except ImportError:
+    brotli = None
+
+
+def build_static_payload(body, mimetype='application/json'):
+    """
+    Precompute everything needed to serve a body that rarely changes.
+
+    Args:
+        body: Response body as bytes
+        mimetype: Content type of the body
+
+    Returns:
+        dict: {'mimetype': str, 'variants': {encoding: (bytes, etag)}} where encoding is
+              'identity', 'gzip' or 'br'
+    """
+    digest = hashlib.sha256(body).hexdigest()[:32]
+    variants = {'identity': (body, digest)}
+    variants['gzip'] = (gzip.compress(body, compresslevel=9, mtime=0), f"{digest}-gz")
+    if brotli is not None:
+        variants['br'] = (brotli.compress(body, quality=11), f"{digest}-br")
+    return {'mimetype': mimetype, 'variants': variants}
+
+
+def static_payload_response(payload, max_age=3600):
+    """
+    Serve a payload from build_static_payload for the current request.
+
+    Picks the best encoding the client accepts, sets a strong ETag per encoding plus
+    Cache-Control, and answers 304 when the client already has a current copy.
+    """
+    variants = payload['variants']
+    encoding = 'identity'
+    for candidate in ('br', 'gzip'):
+        if candidate in variants and request.accept_encodings[candidate] > 0:
+            encoding = candidate
+            break
+    body, etag = variants[encoding]
+
+    if any(request.if_none_match.contains(variant_etag) for _, variant_etag in variants.values()):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype=payload['mimetype'])
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = f"public, max-age={max_age}"
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
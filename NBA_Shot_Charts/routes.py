@@ -1,10 +1,31 @@
-from flask import Blueprint, render_template, request, jsonify
-from . import data, plotting, ai_analysis
+from flask import Blueprint, Response, render_template, request, jsonify, url_for
+from . import data, plotting, ai_analysis, stats, multiseason, baselines, jobs, metrics, resilience
+from .responses import build_static_payload, static_payload_response
 
-import pandas as pd
+import json
+import os
+import time
 
 main_bp = Blueprint('main', __name__)
 
+# 'client' draws shot charts in the browser from /api/shot-chart; 'server' embeds Plotly HTML in the page
+CHART_RENDERING = os.getenv('CHART_RENDERING', 'client')
+
+# Push AI analyses to the page over server-sent events instead of short polls. Each open stream
+# holds a worker until the analysis finishes, so only enable this with threaded or async
+# gunicorn workers (e.g. -k gthread or -k gevent)
+ANALYSIS_STREAMING = os.getenv('ANALYSIS_STREAMING', '0') == '1'
+# Seconds between job store checks while streaming an AI analysis to the browser
+ANALYSIS_STREAM_INTERVAL = float(os.getenv('ANALYSIS_STREAM_INTERVAL', 0.2))
+# Seconds before a pending AI analysis is given up on: the generation budget (waiting for a job
+# worker, then for a generation slot, then the generation itself) plus a margin
+ANALYSIS_TIMEOUT = float(os.getenv('ANALYSIS_TIMEOUT', 2 * ai_analysis.AI_QUEUE_TIMEOUT + ai_analysis.AI_TIMEOUT + 15))
+
+# The player list never changes while the app runs, so its JSON is serialized and compressed once
+_players_payload = None
+# Chart layout, court shapes and trace styles shared by every browser-rendered chart
+_chart_template_payload = None
+
 @main_bp.route('/')
 def index():
     """Render the home page."""
@@ -37,9 +58,15 @@ def comparison_result():
         if not player2_info:
             return render_template('comparison.html', error=f"Player '{player2_name}' not found.")
 
-        # Fetch shot data for both players
-        shot1_df, _ = data.get_player_shotchartdetail(player1_info['id'], season1_id)
-        shot2_df, _ = data.get_player_shotchartdetail(player2_info['id'], season2_id)
+        # Fetch shot data for both players in parallel
+        label1 = f"{player1_name} ({season1_id})"
+        label2 = f"{player2_name} ({season2_id})"
+        shot_data = data.get_player_shotchartdetails({
+            label1: (player1_info['id'], season1_id),
+            label2: (player2_info['id'], season2_id)
+        })
+        shot1_df, _ = shot_data[label1]
+        shot2_df, _ = shot_data[label2]
 
         if shot1_df.empty:
             return render_template('comparison.html', error=f'{player1_name} has no shot data for the {season1_id} season.')
@@ -50,75 +77,29 @@ def comparison_result():
         # Generate shot charts with unique div IDs
         title1 = f"{player1_name} | {season1_id}"
         title2 = f"{player2_name} | {season2_id}"
-        chart1_html = plotting.draw_plot(shot1_df, title1, div_id='shot-chart-1', include_plotlyjs='cdn')
-        chart2_html = plotting.draw_plot(shot2_df, title2, div_id='shot-chart-2', include_plotlyjs=False)
-
-        # Calculate overall stats for player 1
-        total_shots1 = len(shot1_df)
-        made_shots1 = shot1_df['SHOT_MADE_FLAG'].sum()
-        fg_percentage1 = (made_shots1 / total_shots1 * 100) if total_shots1 > 0 else 0
-        
-        player1_stats = {
-            'total_shots': total_shots1,
-            'made_shots': made_shots1,
-            'fg_percentage': round(fg_percentage1, 1)
-        }
-
-        # Calculate overall stats for player 2
-        total_shots2 = len(shot2_df)
-        made_shots2 = shot2_df['SHOT_MADE_FLAG'].sum()
-        fg_percentage2 = (made_shots2 / total_shots2 * 100) if total_shots2 > 0 else 0
-        
-        player2_stats = {
-            'total_shots': total_shots2,
-            'made_shots': made_shots2,
-            'fg_percentage': round(fg_percentage2, 1)
-        }
-
-        # Calculate zone stats for player 1
-        zone_stats1 = shot1_df.groupby('SHOT_ZONE_RANGE')
-        personal_zone_stats1 = pd.DataFrame({
-            'FGM': zone_stats1['SHOT_MADE_FLAG'].sum(),
-            'FGA': zone_stats1.size()
-        }).reset_index()
-        personal_zone_stats1['FG_PCT'] = (personal_zone_stats1['FGM'] / personal_zone_stats1['FGA']).fillna(0)
-        
-        # Calculate zone stats for player 2
-        zone_stats2 = shot2_df.groupby('SHOT_ZONE_RANGE')
-        personal_zone_stats2 = pd.DataFrame({
-            'FGM': zone_stats2['SHOT_MADE_FLAG'].sum(),
-            'FGA': zone_stats2.size()
-        }).reset_index()
-        personal_zone_stats2['FG_PCT'] = (personal_zone_stats2['FGM'] / personal_zone_stats2['FGA']).fillna(0)
-        
-        zone_order = [
-            'Less Than 8 ft.',
-            '8-16 ft.',
-            '16-24 ft.',
-            '24+ ft.',
-            'Back Court Shot'
-        ]
-        
-        # Convert to dictionaries for template
-        player1_zone_stats = personal_zone_stats1.set_index('SHOT_ZONE_RANGE').to_dict('index')
-        player2_zone_stats = personal_zone_stats2.set_index('SHOT_ZONE_RANGE').to_dict('index')
-
-        # Prepare chart data
-        player1_chart_data = []
-        player2_chart_data = []
-        
-        for zone in zone_order:
-            player1_chart_data.append(
-                player1_zone_stats[zone]['FG_PCT'] * 100 if zone in player1_zone_stats else 0
-            )
-            player2_chart_data.append(
-                player2_zone_stats[zone]['FG_PCT'] * 100 if zone in player2_zone_stats else 0
-            )
-
-        # Generate AI comparison analysis
-        ai_comparison = ai_analysis.analyze_player_comparison(
+        chart1_html = chart2_html = None
+        if CHART_RENDERING == 'server':
+            chart1_html = plotting.draw_plot(shot1_df, title1, div_id='shot-chart-1', include_plotlyjs='cdn',
+                                             cache_key=(player1_info['id'], season1_id))
+            chart2_html = plotting.draw_plot(shot2_df, title2, div_id='shot-chart-2', include_plotlyjs=False,
+                                             cache_key=(player2_info['id'], season2_id))
+
+        # Overall and zone stats for both players
+        summary1 = stats.compute_shot_stats(shot1_df)
+        summary2 = stats.compute_shot_stats(shot2_df)
+        player1_stats = summary1['player_stats']
+        player2_stats = summary2['player_stats']
+        player1_zone_stats = summary1['zone_stats']
+        player2_zone_stats = summary2['zone_stats']
+
+        # AI comparison runs in the background; the page fetches it from /api/analysis
+        ai_job_id = jobs.submit(
+            ai_analysis.analyze_player_comparison,
             player1_name, season1_id, player1_stats, player1_zone_stats,
-            player2_name, season2_id, player2_stats, player2_zone_stats
+            player2_name, season2_id, player2_stats, player2_zone_stats,
+            progress_kwarg='on_partial',
+            timeout=ANALYSIS_TIMEOUT,
+            max_queue_wait=ai_analysis.AI_QUEUE_TIMEOUT
         )
 
         return render_template('comparison_result.html',
@@ -126,19 +107,28 @@ def comparison_result():
                                player2_name=player2_name,
                                season1_id=season1_id,
                                season2_id=season2_id,
+                               player1_id=player1_info['id'],
+                               player2_id=player2_info['id'],
+                               title1=title1,
+                               title2=title2,
                                chart1_html=chart1_html,
                                chart2_html=chart2_html,
+                               plotlyjs_url=plotting.PLOTLYJS_CDN_URL,
                                player1_stats=player1_stats,
                                player2_stats=player2_stats,
                                player1_zone_stats=player1_zone_stats,
                                player2_zone_stats=player2_zone_stats,
-                               zone_order=zone_order,
-                               player1_chart_data=player1_chart_data,
-                               player2_chart_data=player2_chart_data,
-                               ai_comparison=ai_comparison)
+                               zone_order=stats.ZONE_ORDER,
+                               player1_chart_data=summary1['zone_fg_pct'],
+                               player2_chart_data=summary2['zone_fg_pct'],
+                               ai_job_id=ai_job_id,
+                               analysis_timeout=ANALYSIS_TIMEOUT,
+                               analysis_streaming=ANALYSIS_STREAMING)
 
     except ValueError as ve:
         return render_template('comparison.html', error=str(ve))
+    except resilience.UpstreamUnavailableError as ue:
+        return render_template('comparison.html', error=f"{ue}. Please try again shortly."), 503
     except Exception as e:
         print(f"An unexpected error occurred: {e}") 
         return render_template('comparison.html', error='An unexpected error occurred. Please try again.')
@@ -149,6 +139,7 @@ def result():
     try:
         player_name = request.form.get('player_name', '').strip()
         season_id = request.form.get('season_id', '').strip()
+        season_end_id = request.form.get('season_end_id', '').strip()
 
         if not player_name or not season_id:
             return render_template('index.html', error='Please provide both a player and a season.')
@@ -157,171 +148,279 @@ def result():
         if not player_info:
             return render_template('index.html', error=f"Player '{player_name}' not found.")
 
+        if season_end_id and season_id != multiseason.CAREER:
+            season_id = multiseason.range_spec(season_id, season_end_id)
+        if multiseason.is_multi_season(season_id):
+            return _multi_season_result(player_name, player_info, season_id)
+
         shot_df, league_avg_df = data.get_player_shotchartdetail(player_info['id'], season_id)
 
         if shot_df.empty:
             return render_template('index.html', error=f'{player_name} has no shot data for the {season_id} season.')
         
         title = f"{player_name} | {season_id} Regular Season"
-        chart_html = plotting.draw_plot(shot_df, title)
-
-        total_shots = len(shot_df)
-        made_shots = shot_df['SHOT_MADE_FLAG'].sum()
-        fg_percentage = (made_shots / total_shots * 100) if total_shots > 0 else 0
-        
-        player_stats = {
-            'total_shots': total_shots,
-            'made_shots': made_shots,
-            'fg_percentage': round(fg_percentage, 1)
-        }
-
-        zone_stats = shot_df.groupby('SHOT_ZONE_RANGE')
-        personal_zone_stats = pd.DataFrame({
-            'FGM': zone_stats['SHOT_MADE_FLAG'].sum(),
-            'FGA': zone_stats.size()
-        }).reset_index()
-        personal_zone_stats['FG_PCT'] = (personal_zone_stats['FGM'] / personal_zone_stats['FGA']).fillna(0)
-        
-        zone_order = [
-            'Less Than 8 ft.',
-            '8-16 ft.',
-            '16-24 ft.',
-            '24+ ft.',
-            'Back Court Shot'
-        ]
-        
-        personal_zone_stats['SHOT_ZONE_RANGE'] = pd.Categorical(
-            personal_zone_stats['SHOT_ZONE_RANGE'],
-            categories=zone_order,
-            ordered=True
-        )
-
-        personal_zone_stats = personal_zone_stats.sort_values('SHOT_ZONE_RANGE')
-        personal_stats_by_zone = personal_zone_stats.set_index('SHOT_ZONE_RANGE').to_dict('index')
-
-        # Prepare league comparison data for AI analysis
-        league_comparison = None
-        try:
-            # Calculate player stats by zone
-            player_zone_stats = shot_df.groupby('SHOT_ZONE_RANGE').agg({
-                'SHOT_MADE_FLAG': ['sum', 'count']
-            }).reset_index()
-            player_zone_stats.columns = ['SHOT_ZONE_RANGE', 'FGM', 'FGA']
-            player_zone_stats['FG_PCT'] = (player_zone_stats['FGM'] / player_zone_stats['FGA'] * 100).round(1)
-            
-            # Calculate league average by zone
-            league_zone_stats = league_avg_df.groupby('SHOT_ZONE_RANGE').agg({
-                'FGM': 'sum',
-                'FGA': 'sum'
-            }).reset_index()
-            league_zone_stats['FG_PCT'] = (league_zone_stats['FGM'] / league_zone_stats['FGA'] * 100).round(1)
-            
-            categories = []
-            player_values = []
-            league_values = []
-            
-            for zone in zone_order:
-                player_row = player_zone_stats[player_zone_stats['SHOT_ZONE_RANGE'] == zone]
-                league_row = league_zone_stats[league_zone_stats['SHOT_ZONE_RANGE'] == zone]
-                
-                if not player_row.empty:
-                    categories.append(zone)
-                    player_values.append(float(player_row['FG_PCT'].iloc[0]))
-                    league_values.append(float(league_row['FG_PCT'].iloc[0]) if not league_row.empty else 0)
-            
-            league_comparison = {
-                'categories': categories,
-                'player_values': player_values,
-                'league_avg': league_values
-            }
-        except Exception as e:
-            print(f"Error preparing league comparison: {e}")
-
-        # Generate AI analysis
-        ai_report = ai_analysis.analyze_player_performance(
+        chart_html = None
+        if CHART_RENDERING == 'server':
+            chart_html = plotting.draw_plot(shot_df, title, cache_key=(player_info['id'], season_id))
+
+        baseline = baselines.get_league_baseline(season_id, league_avg_df=league_avg_df)
+        summary = stats.summarize(stats.aggregate_shots(shot_df), baseline['range'] if baseline else None)
+        player_stats = summary['player_stats']
+        personal_stats_by_zone = summary['zone_stats']
+        league_comparison = summary['league_comparison']
+
+        # AI analysis runs in the background; the page fetches it from /api/analysis
+        ai_job_id = jobs.submit(
+            ai_analysis.analyze_player_performance,
             player_name, 
             season_id, 
             player_stats, 
             personal_stats_by_zone,
-            league_comparison
+            league_comparison,
+            progress_kwarg='on_partial',
+            timeout=ANALYSIS_TIMEOUT,
+            max_queue_wait=ai_analysis.AI_QUEUE_TIMEOUT
         )
 
         return render_template('result.html',
                                title=title,
                                chart_html=chart_html,
+                               plotlyjs_url=plotting.PLOTLYJS_CDN_URL,
                                player_stats=player_stats,
                                personal_stats_by_zone=personal_stats_by_zone,
                                player_id=player_info['id'],
                                season_id=season_id,
-                               ai_analysis=ai_report)
+                               league_comparison=league_comparison,
+                               chart_modes=['scatter', 'density'],
+                               ai_job_id=ai_job_id,
+                               analysis_timeout=ANALYSIS_TIMEOUT,
+                               analysis_streaming=ANALYSIS_STREAMING)
 
     except ValueError as ve:
         return render_template('index.html', error=str(ve))
+    except resilience.UpstreamUnavailableError as ue:
+        return render_template('index.html', error=f"{ue}. Please try again shortly."), 503
     except Exception as e:
         print(f"An unexpected error occurred: {e}") 
         return render_template('index.html', error='An unexpected error occurred. Please try again.')
 
+def _multi_season_result(player_name, player_info, season_spec):
+    """Render the result page for a season range or a whole career from merged per-season aggregates."""
+    combined = multiseason.get_multi_season_summary(player_info['id'], season_spec)
+    summary = combined['summary']
+    player_stats = summary['player_stats']
+
+    if player_stats['total_shots'] == 0:
+        return render_template('index.html', error=f'{player_name} has no shot data for the selected seasons.')
+
+    seasons_label = multiseason.season_label(combined['seasons'])
+    if season_spec == multiseason.CAREER:
+        seasons_label = f"Career ({seasons_label})"
+    title = f"{player_name} | {seasons_label} Regular Season"
+
+    # Individual shots across many seasons are too dense to read, so ranges are drawn as hexbins
+    chart_html = None
+    if CHART_RENDERING == 'server':
+        chart_html = plotting.draw_density(combined['bins'], title, player_stats['made_shots'],
+                                           player_stats['total_shots'])
+
+    ai_job_id = jobs.submit(
+        ai_analysis.analyze_player_performance,
+        player_name,
+        seasons_label,
+        player_stats,
+        summary['zone_stats'],
+        summary['league_comparison'],
+        progress_kwarg='on_partial',
+        timeout=ANALYSIS_TIMEOUT,
+        max_queue_wait=ai_analysis.AI_QUEUE_TIMEOUT
+    )
+
+    return render_template('result.html',
+                           title=title,
+                           chart_html=chart_html,
+                           plotlyjs_url=plotting.PLOTLYJS_CDN_URL,
+                           player_stats=player_stats,
+                           personal_stats_by_zone=summary['zone_stats'],
+                           player_id=player_info['id'],
+                           season_id=season_spec,
+                           league_comparison=summary['league_comparison'],
+                           chart_modes=['density'],
+                           ai_job_id=ai_job_id,
+                           analysis_timeout=ANALYSIS_TIMEOUT,
+                           analysis_streaming=ANALYSIS_STREAMING)
+
 
 @main_bp.route('/api/player-comparison/<int:player_id>/<season_id>')
 def api_player_comparison(player_id, season_id):
     """Get player stats compared to league average for a specific season."""
     try:
         shot_df, league_avg_df = data.get_player_shotchartdetail(player_id, season_id)
+        baseline = baselines.get_league_baseline(season_id, league_avg_df=league_avg_df)
         
-        if shot_df.empty or league_avg_df.empty:
+        if shot_df.empty or baseline is None:
             return jsonify({"error": "No data available"}), 404
         
-        # Calculate player stats by zone
-        player_zone_stats = shot_df.groupby('SHOT_ZONE_RANGE').agg({
-            'SHOT_MADE_FLAG': ['sum', 'count']
-        }).reset_index()
-        player_zone_stats.columns = ['SHOT_ZONE_RANGE', 'FGM', 'FGA']
-        player_zone_stats['FG_PCT'] = (player_zone_stats['FGM'] / player_zone_stats['FGA'] * 100).round(1)
-        
-        # Calculate league average by zone
-        league_zone_stats = league_avg_df.groupby('SHOT_ZONE_RANGE').agg({
-            'FGM': 'sum',
-            'FGA': 'sum'
-        }).reset_index()
-        league_zone_stats['FG_PCT'] = (league_zone_stats['FGM'] / league_zone_stats['FGA'] * 100).round(1)
-        
-        # Merge and prepare data for chart
-        zone_order = [
-            'Less Than 8 ft.',
-            '8-16 ft.',
-            '16-24 ft.',
-            '24+ ft.',
-            'Back Court Shot'
-        ]
-        
-        categories = []
-        player_values = []
-        league_values = []
-        
-        for zone in zone_order:
-            player_row = player_zone_stats[player_zone_stats['SHOT_ZONE_RANGE'] == zone]
-            league_row = league_zone_stats[league_zone_stats['SHOT_ZONE_RANGE'] == zone]
-            
-            if not player_row.empty:
-                categories.append(zone)
-                player_values.append(float(player_row['FG_PCT'].iloc[0]))
-                league_values.append(float(league_row['FG_PCT'].iloc[0]) if not league_row.empty else 0)
-        
-        return jsonify({
-            'categories': categories,
-            'player_values': player_values,
-            'league_avg': league_values
-        })
+        return jsonify(stats.summarize(stats.aggregate_shots(shot_df), baseline['range'])['league_comparison'])
         
+    except resilience.UpstreamUnavailableError as ue:
+        return jsonify({"error": str(ue)}), 503
     except Exception as e:
         print(f"Error in player comparison: {e}")
         return jsonify({"error": str(e)}), 500
 
 
+@main_bp.route('/api/analysis/<job_id>')
+def api_analysis(job_id):
+    """Status of a background AI analysis job, with the rendered HTML once it is done."""
+    job = jobs.get_job(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired analysis job"}), 404
+    if job['status'] == jobs.DONE:
+        return jsonify({"status": job['status'], "html": job['result']})
+    if job['status'] == jobs.FAILED:
+        return jsonify({"status": job['status'], "error": job['error']})
+    return jsonify({"status": job['status'], "html": job.get('partial')})
+
+
+@main_bp.route('/api/analysis/<job_id>/stream')
+def api_analysis_stream(job_id):
+    """
+    Server-sent events for a background AI analysis job: 'partial' events carry the
+    HTML generated so far, then a single 'done' or 'failed' event ends the stream.
+    Only served when ANALYSIS_STREAMING is enabled.
+    """
+    if not ANALYSIS_STREAMING:
+        return jsonify({"error": "Analysis streaming is disabled"}), 404
+
+    def events():
+        last_partial = None
+        deadline = time.monotonic() + ANALYSIS_TIMEOUT
+        while time.monotonic() < deadline:
+            job = jobs.get_job(job_id)
+            if job is None:
+                yield f"event: failed\ndata: {json.dumps('Unknown or expired analysis job')}\n\n"
+                return
+            if job['status'] == jobs.DONE:
+                yield f"event: done\ndata: {json.dumps(job['result'])}\n\n"
+                return
+            if job['status'] == jobs.FAILED:
+                yield f"event: failed\ndata: {json.dumps(job['error'])}\n\n"
+                return
+            partial = job.get('partial')
+            if partial is not None and partial != last_partial:
+                last_partial = partial
+                yield f"event: partial\ndata: {json.dumps(partial)}\n\n"
+            time.sleep(ANALYSIS_STREAM_INTERVAL)
+        yield f"event: failed\ndata: {json.dumps('Timed out')}\n\n"
+
+    response = Response(events(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Stop nginx from buffering the stream
+    return response
+
+
+@main_bp.route('/api/shot-chart/<int:player_id>/<season_id>')
+def api_shot_chart(player_id, season_id):
+    """
+    Compact shot data for drawing a player's shot chart in the browser (?mode=density for hexbins).
+    season_id may also be a range ('2015-16:2019-20') or 'career', which is always drawn as hexbins.
+    """
+    try:
+        if multiseason.is_multi_season(season_id):
+            combined = multiseason.get_multi_season_summary(player_id, season_id)
+            player_stats = combined['summary']['player_stats']
+            if player_stats['total_shots'] == 0:
+                return jsonify({"error": "No data available"}), 404
+            response = jsonify(plotting.build_density_spec(
+                combined['bins'], player_stats['made_shots'], player_stats['total_shots']
+            ))
+            if season_id != multiseason.CAREER and all(data.is_season_finished(s) for s in combined['seasons']):
+                response.headers['Cache-Control'] = 'public, max-age=86400'
+            return response
+
+        shot_df, _ = data.get_player_shotchartdetail(player_id, season_id)
+
+        if shot_df.empty:
+            return jsonify({"error": "No data available"}), 404
+
+        if request.args.get('mode') == 'density':
+            made_shots = int(shot_df['SHOT_MADE_FLAG'].sum())
+            spec = plotting.build_density_spec(plotting.bin_shots(shot_df), made_shots, len(shot_df))
+        else:
+            spec = plotting.build_chart_spec(shot_df)
+        response = jsonify(spec)
+        if data.is_season_finished(season_id):
+            response.headers['Cache-Control'] = 'public, max-age=86400'
+        return response
+
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 404
+    except resilience.UpstreamUnavailableError as ue:
+        return jsonify({"error": str(ue)}), 503
+    except Exception as e:
+        print(f"Error in shot chart spec: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+def _get_chart_template_payload():
+    global _chart_template_payload
+    if _chart_template_payload is None:
+        body = json.dumps(plotting.chart_template(), separators=(',', ':')).encode('utf-8')
+        _chart_template_payload = build_static_payload(body)
+    return _chart_template_payload
+
+
+@main_bp.app_template_global()
+def chart_template_url():
+    """URL of the chart template, versioned by its digest so a deploy that changes it is never served from a stale browser cache."""
+    return url_for('main.api_chart_template', v=_get_chart_template_payload()['variants']['identity'][1])
+
+
+@main_bp.route('/api/chart-template')
+def api_chart_template():
+    """
+    Static chart layout, court shapes and trace styles for browser-rendered shot charts.
+    Versioned URLs (see chart_template_url) are cached for a week; anything else is revalidated with the ETag.
+    """
+    payload = _get_chart_template_payload()
+    if request.args.get('v') == payload['variants']['identity'][1]:
+        return static_payload_response(payload, max_age=7 * 24 * 60 * 60)
+    return static_payload_response(payload, max_age=0)
+
+
 @main_bp.route('/api/players')
 def api_players():
-    players_list = data.get_all_players()
-    return jsonify([{'id': p['id'], 'name': p['full_name']} for p in players_list])
+    global _players_payload
+    if _players_payload is None:
+        players_list = data.get_all_players()
+        body = json.dumps(
+            [{'id': p['id'], 'name': p['full_name']} for p in players_list],
+            ensure_ascii=False, separators=(',', ':')
+        ).encode('utf-8')
+        _players_payload = build_static_payload(body)
+    return static_payload_response(_players_payload, max_age=24 * 60 * 60)
+
+@main_bp.route('/metrics')
+def prometheus_metrics():
+    """Stage latency histograms, upstream error counters and cache hit ratios for Prometheus."""
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+@main_bp.route('/api/players/search')
+def api_players_search():
+    """Return a page of player suggestions for a partial or misspelled name."""
+    query = request.args.get('q', '').strip()
+    limit = max(1, min(request.args.get('limit', 10, type=int), 50))
+    page = max(request.args.get('page', 1, type=int), 1)
+    active_only = request.args.get('active', '0') in ('1', 'true')
+
+    matches, total = data.search_players(query, limit=limit, offset=(page - 1) * limit, active_only=active_only)
+    return jsonify({
+        'results': [{'id': p['id'], 'name': p['full_name'], 'is_active': p['is_active']} for p in matches],
+        'total': total,
+        'page': page,
+        'limit': limit
+    })
 
 @main_bp.route('/api/player/<int:player_id>/seasons')
 def api_player_seasons(player_id):
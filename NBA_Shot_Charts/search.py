@@ -0,0 +1,132 @@
+import re
+import unicodedata
+from collections import Counter
+
+# --- Constants ---
+FUZZY_MIN_SIMILARITY = 0.3  # Minimum trigram similarity for a typo-tolerant match
+NGRAM_SIZE = 3
+
+
+def normalize(text):
+    """
+    Lowercase, strip accents and punctuation, and collapse whitespace.
+    Example: 'Nikola Jokić' returns 'nikola jokic', "D'Angelo Russell" returns 'dangelo russell'
+    """
+    decomposed = unicodedata.normalize('NFKD', text)
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    stripped = re.sub(r"['.]", '', stripped.lower())
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', stripped).split())
+
+
+def _ngrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + NGRAM_SIZE] for i in range(len(padded) - NGRAM_SIZE + 1)}
+
+
+class PlayerSearchIndex:
+    """
+    Precomputed search structures over the player list.
+
+    A prefix trie over every name token answers as-you-type queries ('steph cur'),
+    and a trigram index over full names catches typos ('lebron jmaes').
+    """
+
+    def __init__(self, players):
+        """
+        Args:
+            players: List of player dicts with id, full_name and is_active
+        """
+        self._players = list(players)
+        self._names = [normalize(player['full_name']) for player in self._players]
+        self._by_name = {}
+        self._trie = {}
+        self._ngrams = {}
+
+        for position, name in enumerate(self._names):
+            self._by_name.setdefault(name, position)
+            for token in set(name.split()):
+                node = self._trie
+                for char in token:
+                    node = node.setdefault(char, {})
+                    node.setdefault('ids', set()).add(position)
+            for gram in _ngrams(name):
+                self._ngrams.setdefault(gram, []).append(position)
+
+        self._ngram_counts = [len(_ngrams(name)) for name in self._names]
+        # The index is read-only once built
+        self._freeze(self._trie)
+
+    def _freeze(self, node):
+        for char, child in node.items():
+            if char == 'ids':
+                continue
+            child['ids'] = frozenset(child['ids'])
+            self._freeze(child)
+
+    def _prefix_matches(self, token):
+        node = self._trie
+        for char in token:
+            node = node.get(char)
+            if node is None:
+                return frozenset()
+        return node.get('ids', frozenset())
+
+    def find_exact(self, name):
+        """
+        Accent- and punctuation-insensitive full name lookup.
+
+        Returns:
+            dict: Player dictionary or None if not found.
+        """
+        position = self._by_name.get(normalize(name))
+        return self._players[position] if position is not None else None
+
+    def search(self, query, limit=10, offset=0, active_only=False):
+        """
+        Find players matching a partial or misspelled name.
+
+        Prefix matches on every query token rank first (exact and leading matches
+        highest), followed by trigram matches above FUZZY_MIN_SIMILARITY.
+        Ties are broken by active status and then name.
+
+        Returns:
+            tuple: (list of player dicts for the requested page, total number of matches)
+        """
+        normalized = normalize(query)
+        if not normalized:
+            return [], 0
+
+        scores = {}
+        tokens = normalized.split()
+        prefix_ids = self._prefix_matches(tokens[0])
+        for token in tokens[1:]:
+            prefix_ids = prefix_ids & self._prefix_matches(token)
+        for position in prefix_ids:
+            name = self._names[position]
+            if name == normalized:
+                scores[position] = 3.0
+            elif name.startswith(normalized):
+                scores[position] = 2.5
+            else:
+                scores[position] = 2.0
+
+        if len(normalized) >= NGRAM_SIZE:
+            query_grams = _ngrams(normalized)
+            shared = Counter()
+            for gram in query_grams:
+                shared.update(self._ngrams.get(gram, ()))
+            for position, count in shared.items():
+                if position in scores:
+                    continue
+                similarity = count / (len(query_grams) + self._ngram_counts[position] - count)
+                if similarity >= FUZZY_MIN_SIMILARITY:
+                    scores[position] = similarity
+
+        if active_only:
+            scores = {position: score for position, score in scores.items() if self._players[position]['is_active']}
+
+        ranked = sorted(
+            scores,
+            key=lambda position: (-scores[position], not self._players[position]['is_active'], self._names[position])
+        )
+        return [self._players[position] for position in ranked[offset:offset + limit]], len(ranked)
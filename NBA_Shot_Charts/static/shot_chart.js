@@ -0,0 +1,82 @@
+// Draws shot charts in the browser from the compact /api/shot-chart spec.
+// Layout, court shapes and trace styles come from /api/chart-template?v=<digest>, fetched once and cached by the browser.
+
+const chartTemplates = {};
+
+function fetchChartTemplate(templateUrl) {
+    if (!chartTemplates[templateUrl]) {
+        chartTemplates[templateUrl] = fetch(templateUrl).then(response => response.json());
+    }
+    return chartTemplates[templateUrl];
+}
+
+function decodeBase64(encoded) {
+    const binary = atob(encoded);
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) {
+        bytes[i] = binary.charCodeAt(i);
+    }
+    return bytes.buffer;
+}
+
+function chartTitle(title, madeShots, totalShots) {
+    const fgPct = totalShots > 0 ? (madeShots / totalShots * 100) : 0;
+    return `${title}<br><sub>FG%: ${fgPct.toFixed(1)}% (${madeShots}/${totalShots})</sub>`;
+}
+
+function scatterTraces(spec, template) {
+    const locX = new Int16Array(decodeBase64(spec.loc_x));
+    const locY = new Int16Array(decodeBase64(spec.loc_y));
+    const distance = new Uint8Array(decodeBase64(spec.distance));
+    const madeBits = new Uint8Array(decodeBase64(spec.made));
+    const actionCodes = spec.action_type_dtype === 'uint16'
+        ? new Uint16Array(decodeBase64(spec.action_type))
+        : new Uint8Array(decodeBase64(spec.action_type));
+
+    const missed = {x: [], y: [], customdata: []};
+    const made = {x: [], y: [], customdata: []};
+    for (let i = 0; i < spec.count; i++) {
+        const target = (madeBits[i >> 3] >> (i & 7)) & 1 ? made : missed;
+        target.x.push(locX[i]);
+        target.y.push(locY[i]);
+        target.customdata.push([distance[i], spec.action_types[actionCodes[i]]]);
+    }
+
+    return [
+        Object.assign({type: 'scatter'}, template.traces.missed, missed),
+        Object.assign({type: 'scatter'}, template.traces.made, made)
+    ];
+}
+
+function densityTraces(spec, template) {
+    const style = template.traces.density;
+    const customdata = spec.attempts.map((attempts, i) => [attempts, spec.makes[i], spec.fg_pct[i] * 100]);
+    return [Object.assign({type: 'scatter'}, style, {
+        x: spec.x,
+        y: spec.y,
+        customdata: customdata,
+        marker: Object.assign({}, style.marker, {size: spec.size, color: spec.fg_pct})
+    })];
+}
+
+function renderShotChart(divId, specUrl, templateUrl, title) {
+    return Promise.all([
+        fetch(specUrl).then(response => {
+            if (!response.ok) {
+                throw new Error(`Shot chart request failed: ${response.status}`);
+            }
+            return response.json();
+        }),
+        fetchChartTemplate(templateUrl)
+    ]).then(([spec, template]) => {
+        const layout = Object.assign({}, template.layout, {
+            title: Object.assign({text: chartTitle(title, spec.made_shots, spec.count)}, template.title_style)
+        });
+        const traces = spec.mode === 'density' ? densityTraces(spec, template) : scatterTraces(spec, template);
+        Plotly.newPlot(divId, traces, layout, template.config);
+    }).catch(error => {
+        console.error('Error loading shot chart:', error);
+        document.getElementById(divId).innerHTML =
+            '<p style="text-align: center; color: #999;">Unable to load shot chart</p>';
+    });
+}
@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+from . import metrics
+
+# --- Constants ---
+ZONE_ORDER = [
+    'Less Than 8 ft.',
+    '8-16 ft.',
+    '16-24 ft.',
+    '24+ ft.',
+    'Back Court Shot'
+]
+
+
+def _zone_codes(zones):
+    """Map SHOT_ZONE_RANGE values to their position in ZONE_ORDER (-1 for unknown zones)."""
+    return pd.Categorical(zones, categories=ZONE_ORDER).codes
+
+
+@metrics.timed('stats.aggregate_shots')
+def aggregate_shots(shot_df):
+    """
+    Count made and attempted shots per zone in a single pass.
+
+    Returns:
+        dict: {'fgm': array, 'fga': array} aligned with ZONE_ORDER, plus overall
+              'total_shots' and 'made_shots'
+    """
+    codes = _zone_codes(shot_df['SHOT_ZONE_RANGE'])
+    made = shot_df['SHOT_MADE_FLAG'].to_numpy(dtype=np.int64)
+    known = codes >= 0
+    return {
+        'fgm': np.bincount(codes[known], weights=made[known], minlength=len(ZONE_ORDER)).astype(np.int64),
+        'fga': np.bincount(codes[known], minlength=len(ZONE_ORDER)),
+        'total_shots': len(made),
+        'made_shots': int(made.sum())
+    }
+
+
+def aggregate_league(league_avg_df):
+    """
+    Sum the league averages table per zone.
+
+    Returns:
+        dict: {'fgm': array, 'fga': array} aligned with ZONE_ORDER
+    """
+    codes = _zone_codes(league_avg_df['SHOT_ZONE_RANGE'])
+    known = codes >= 0
+    return {
+        'fgm': np.bincount(codes[known], weights=league_avg_df['FGM'].to_numpy()[known], minlength=len(ZONE_ORDER)),
+        'fga': np.bincount(codes[known], weights=league_avg_df['FGA'].to_numpy()[known], minlength=len(ZONE_ORDER))
+    }
+
+
+def empty_totals():
+    """Totals for a season with no shots."""
+    return {
+        'fgm': np.zeros(len(ZONE_ORDER), dtype=np.int64),
+        'fga': np.zeros(len(ZONE_ORDER), dtype=np.int64),
+        'total_shots': 0,
+        'made_shots': 0
+    }
+
+
+def merge_totals(totals_list):
+    """
+    Add up totals from several aggregate_shots (or aggregate_league) results,
+    e.g. one per season, without touching the underlying shots again.
+    """
+    return {key: sum(totals[key] for totals in totals_list) for key in totals_list[0]}
+
+
+def summarize(totals, league_totals=None):
+    """
+    Turn per-zone totals into the structures the templates and AI prompts use.
+
+    Args:
+        totals: Output of aggregate_shots
+        league_totals: Output of aggregate_league, or None to skip the league comparison
+
+    Returns:
+        dict with:
+            player_stats: {'total_shots', 'made_shots', 'fg_percentage'}
+            zone_stats: {zone: {'FGM', 'FGA', 'FG_PCT'}} for zones with attempts, in ZONE_ORDER
+            zone_fg_pct: FG% (0-100) for every zone in ZONE_ORDER, 0 where there are no attempts
+            league_comparison: {'categories', 'player_values', 'league_avg'} or None
+    """
+    fgm, fga = totals['fgm'], totals['fga']
+    total_shots, made_shots = totals['total_shots'], totals['made_shots']
+    fg_pct = np.divide(fgm, fga, out=np.zeros(len(ZONE_ORDER)), where=fga > 0)
+    present = np.flatnonzero(fga > 0)
+
+    summary = {
+        'player_stats': {
+            'total_shots': total_shots,
+            'made_shots': made_shots,
+            'fg_percentage': round((made_shots / total_shots * 100) if total_shots > 0 else 0, 1)
+        },
+        'zone_stats': {
+            ZONE_ORDER[i]: {'FGM': int(fgm[i]), 'FGA': int(fga[i]), 'FG_PCT': float(fg_pct[i])}
+            for i in present
+        },
+        'zone_fg_pct': (fg_pct * 100).tolist(),
+        'league_comparison': None
+    }
+
+    if league_totals is not None:
+        league_fga = league_totals['fga']
+        league_pct = np.divide(league_totals['fgm'], league_fga, out=np.zeros(len(ZONE_ORDER)), where=league_fga > 0)
+        summary['league_comparison'] = {
+            'categories': [ZONE_ORDER[i] for i in present],
+            'player_values': np.round(fg_pct[present] * 100, 1).tolist(),
+            'league_avg': np.round(league_pct[present] * 100, 1).tolist()
+        }
+
+    return summary
+
+
+def compute_shot_stats(shot_df, league_avg_df=None):
+    """Aggregate and summarize a player's shots (and optionally the league averages) in one call."""
+    league_totals = aggregate_league(league_avg_df) if league_avg_df is not None else None
+    return summarize(aggregate_shots(shot_df), league_totals)
@@ -0,0 +1,150 @@
+import glob
+import json
+import os
+
+import pandas as pd
+
+# --- Configuration ---
+WAREHOUSE_DIR = os.getenv('SHOT_WAREHOUSE_DIR', 'warehouse')
+
+# Layout, one partition per season:
+#   <WAREHOUSE_DIR>/<season_type>/season=<season_id>/
+#       parts/player_<id>.parquet   per-player files written while a season is being ingested
+#       shots.parquet               all shots for the season, sorted by PLAYER_ID (after compaction)
+#       league_averages.parquet     the LeagueAverages frame for the season
+#       _checkpoint.json            player IDs already ingested
+#       _SUCCESS                    marker written once the season is compacted
+
+
+def _season_type_slug(season_type):
+    return season_type.lower().replace(' ', '_')
+
+
+def season_dir(season_id, season_type='Regular Season', warehouse_dir=None):
+    """Return the partition directory for one season."""
+    return os.path.join(warehouse_dir or WAREHOUSE_DIR, _season_type_slug(season_type), f"season={season_id}")
+
+
+def _write_atomic(path, write):
+    """Write a file through a temporary path so readers never see a partial file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def is_season_complete(season_id, season_type='Regular Season', warehouse_dir=None):
+    """True once a season has been fully ingested and compacted."""
+    return os.path.exists(os.path.join(season_dir(season_id, season_type, warehouse_dir), '_SUCCESS'))
+
+
+def load_checkpoint(season_id, season_type='Regular Season', warehouse_dir=None):
+    """
+    Returns:
+        set: Player IDs already ingested for the season.
+    """
+    path = os.path.join(season_dir(season_id, season_type, warehouse_dir), '_checkpoint.json')
+    if not os.path.exists(path):
+        return set()
+    with open(path) as f:
+        return set(json.load(f)['players'])
+
+
+def save_checkpoint(season_id, done_player_ids, season_type='Regular Season', warehouse_dir=None):
+    """Record which players have been ingested for the season."""
+    path = os.path.join(season_dir(season_id, season_type, warehouse_dir), '_checkpoint.json')
+
+    def write(tmp_path):
+        with open(tmp_path, 'w') as f:
+            json.dump({'players': sorted(done_player_ids)}, f)
+
+    _write_atomic(path, write)
+
+
+def write_player_part(season_id, player_id, shot_df, season_type='Regular Season', warehouse_dir=None):
+    """Store one player's shots for a season. Players with no shots are skipped."""
+    if shot_df.empty:
+        return
+    path = os.path.join(season_dir(season_id, season_type, warehouse_dir), 'parts', f"player_{int(player_id)}.parquet")
+    _write_atomic(path, lambda tmp_path: shot_df.to_parquet(tmp_path, index=False))
+
+
+def write_league_averages(season_id, league_avg_df, season_type='Regular Season', warehouse_dir=None):
+    """Store the league averages frame for a season."""
+    path = os.path.join(season_dir(season_id, season_type, warehouse_dir), 'league_averages.parquet')
+    _write_atomic(path, lambda tmp_path: league_avg_df.to_parquet(tmp_path, index=False))
+
+
+def compact_season(season_id, season_type='Regular Season', warehouse_dir=None):
+    """
+    Merge the per-player parts of a season into a single shots.parquet and mark it complete.
+    Shots are sorted by PLAYER_ID so single-player reads only touch a few row groups.
+    """
+    directory = season_dir(season_id, season_type, warehouse_dir)
+    part_paths = sorted(glob.glob(os.path.join(directory, 'parts', '*.parquet')))
+    if part_paths:
+        shots = pd.concat([pd.read_parquet(path) for path in part_paths], ignore_index=True)
+        shots = shots.sort_values(['PLAYER_ID', 'GAME_ID', 'GAME_EVENT_ID'], kind='stable')
+        _write_atomic(
+            os.path.join(directory, 'shots.parquet'),
+            lambda tmp_path: shots.to_parquet(tmp_path, index=False, row_group_size=20000)
+        )
+
+    with open(os.path.join(directory, '_SUCCESS'), 'w'):
+        pass
+
+    for path in part_paths:
+        os.remove(path)
+
+
+def read_league_averages(season_id, season_type='Regular Season', warehouse_dir=None):
+    """
+    Returns:
+        DataFrame: The league averages frame for an ingested season, or None if it has not been ingested.
+    """
+    if not is_season_complete(season_id, season_type, warehouse_dir):
+        return None
+    path = os.path.join(season_dir(season_id, season_type, warehouse_dir), 'league_averages.parquet')
+    if not os.path.exists(path):
+        return None
+    return pd.read_parquet(path)
+
+
+def read_player_shots(player_id, team_id, season_id, season_type='Regular Season', warehouse_dir=None,
+                      columns=None):
+    """
+    Read a player's shots for a season from the warehouse.
+
+    Shots are filtered to team_id to match what the live ShotChartDetail call returns.
+    With team_id=None the team is taken from the stored shots: the one the player took
+    their first shot of the season for, matching the first team in their career table.
+    This lets ingested seasons be served without looking up the career table upstream.
+    Pass columns to read only those columns.
+
+    Returns:
+        tuple: (shot_df, league_avg_df), or None if the season or player has not been ingested.
+    """
+    if int(player_id) not in load_checkpoint(season_id, season_type, warehouse_dir):
+        return None
+    league_avg_df = read_league_averages(season_id, season_type, warehouse_dir)
+    if league_avg_df is None:
+        return None
+
+    shots_path = os.path.join(season_dir(season_id, season_type, warehouse_dir), 'shots.parquet')
+    if not os.path.exists(shots_path):
+        return pd.DataFrame(columns=columns), league_avg_df
+
+    filters = [('PLAYER_ID', '=', int(player_id))]
+    if team_id is not None:
+        filters.append(('TEAM_ID', '=', int(team_id)))
+        shot_df = pd.read_parquet(shots_path, columns=columns, filters=filters)
+    else:
+        read_columns = None if columns is None else list(dict.fromkeys(list(columns) + ['TEAM_ID', 'GAME_DATE']))
+        shot_df = pd.read_parquet(shots_path, columns=read_columns, filters=filters)
+        if not shot_df.empty:
+            # GAME_DATE is YYYYMMDD, so the earliest game sorts first
+            first_team = shot_df.sort_values('GAME_DATE', kind='stable')['TEAM_ID'].iloc[0]
+            shot_df = shot_df[shot_df['TEAM_ID'] == first_team]
+        if columns is not None:
+            shot_df = shot_df[list(columns)]
+    return shot_df.reset_index(drop=True), league_avg_df
@@ -0,0 +1,116 @@
+"""
+Synthetic NBA data in the layout LocalProvider reads.
+
+Shots are drawn from a fixed seed, so every benchmark run sees the same data.
+Frames use the ShotChartDetail / PlayerCareerStats column names and dtypes.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+SEASONS = [f"{year}-{(year + 1) % 100:02d}" for year in range(2003, 2023)]  # 20 seasons, 2003-04 to 2022-23
+PLAYERS = [
+    {'id': 201939, 'full_name': 'Stephen Curry', 'first_name': 'Stephen', 'last_name': 'Curry', 'is_active': True},
+    {'id': 2544, 'full_name': 'LeBron James', 'first_name': 'LeBron', 'last_name': 'James', 'is_active': True},
+    {'id': 203999, 'full_name': 'Nikola Jokić', 'first_name': 'Nikola', 'last_name': 'Jokić', 'is_active': True},
+    {'id': 977, 'full_name': 'Kobe Bryant', 'first_name': 'Kobe', 'last_name': 'Bryant', 'is_active': False},
+]
+TEAM_ID = 1610612744
+
+_ACTION_TYPES = ['Jump Shot', 'Pullup Jump shot', 'Step Back Jump shot', 'Driving Layup Shot',
+                 'Layup Shot', 'Dunk Shot', 'Floating Jump shot', 'Tip Layup Shot']
+_ZONE_BASIC = ['Restricted Area', 'In The Paint (Non-RA)', 'Mid-Range', 'Above the Break 3', 'Backcourt']
+_ZONE_AREA = ['Center(C)', 'Left Side(L)', 'Left Side Center(LC)', 'Right Side(R)', 'Right Side Center(RC)']
+_ZONE_RANGE = ['Less Than 8 ft.', '8-16 ft.', '16-24 ft.', '24+ ft.', 'Back Court Shot']
+
+
+def synthetic_shots(count, player_id=201939, team_id=TEAM_ID, seed=0):
+    """
+    Returns:
+        DataFrame: count shots with every ShotChartDetail column, spread over the half court.
+    """
+    rng = np.random.default_rng(seed)
+    distance = np.clip(rng.gamma(2.0, 7.0, count), 0, 80)
+    angle = rng.uniform(0, np.pi, count)
+    loc_x = np.clip(np.round(distance * 10 * np.cos(angle)), -250, 250).astype(int)
+    loc_y = np.clip(np.round(distance * 10 * np.sin(angle)) - 40, -50, 800).astype(int)
+    made = rng.random(count) < np.clip(0.65 - distance * 0.012, 0.05, 0.9)
+
+    zone = np.select([distance < 8, distance < 16, distance < 24, loc_y < 420], [0, 1, 2, 3], default=4)
+    return pd.DataFrame({
+        'GRID_TYPE': 'Shot Chart Detail',
+        'GAME_ID': [f"00{22200001 + i // 20}" for i in range(count)],
+        'GAME_EVENT_ID': np.arange(count) % 20 * 10 + 7,
+        'PLAYER_ID': player_id,
+        'PLAYER_NAME': 'Synthetic Player',
+        'TEAM_ID': team_id,
+        'TEAM_NAME': 'Golden State Warriors',
+        'PERIOD': rng.integers(1, 5, count),
+        'MINUTES_REMAINING': rng.integers(0, 12, count),
+        'SECONDS_REMAINING': rng.integers(0, 60, count),
+        'EVENT_TYPE': np.where(made, 'Made Shot', 'Missed Shot'),
+        'ACTION_TYPE': rng.choice(_ACTION_TYPES, count),
+        'SHOT_TYPE': np.where(distance >= 23.75, '3PT Field Goal', '2PT Field Goal'),
+        'SHOT_ZONE_BASIC': np.array(_ZONE_BASIC)[zone],
+        'SHOT_ZONE_AREA': rng.choice(_ZONE_AREA, count),
+        'SHOT_ZONE_RANGE': np.array(_ZONE_RANGE)[zone],
+        'SHOT_DISTANCE': np.round(distance).astype(int),
+        'LOC_X': loc_x,
+        'LOC_Y': loc_y,
+        'SHOT_ATTEMPTED_FLAG': 1,
+        'SHOT_MADE_FLAG': made.astype(int),
+        'GAME_DATE': '20230115',
+        'HTM': 'GSW',
+        'VTM': 'LAL',
+    })
+
+
+def league_averages():
+    """
+    Returns:
+        DataFrame: A LeagueAverages frame with one row per basic zone / area / range combination.
+    """
+    rows = []
+    for zone_index, (basic, zone_range) in enumerate(zip(_ZONE_BASIC, _ZONE_RANGE)):
+        for area in _ZONE_AREA:
+            fga = 4000 - zone_index * 600
+            fgm = int(fga * (0.62 - zone_index * 0.1))
+            rows.append({'GRID_TYPE': 'League Averages', 'SHOT_ZONE_BASIC': basic, 'SHOT_ZONE_AREA': area,
+                         'SHOT_ZONE_RANGE': zone_range, 'FGA': fga, 'FGM': fgm, 'FG_PCT': round(fgm / fga, 3)})
+    return pd.DataFrame(rows)
+
+
+def _frame_payload(df):
+    return {'columns': df.columns.tolist(), 'data': json.loads(df.to_json(orient='values'))}
+
+
+def _write(path, payload):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(payload, f)
+
+
+def write_fixtures(fixtures_dir, shots_per_season=1500, seed=0):
+    """Write players, careers and shot charts for PLAYERS over SEASONS into fixtures_dir."""
+    _write(os.path.join(fixtures_dir, 'players.json'), PLAYERS)
+    league = league_averages()
+
+    for player_number, player in enumerate(PLAYERS):
+        career = pd.DataFrame({
+            'PLAYER_ID': player['id'],
+            'SEASON_ID': SEASONS,
+            'LEAGUE_ID': '00',
+            'TEAM_ID': TEAM_ID,
+            'TEAM_ABBREVIATION': 'GSW',
+            'GP': 70,
+        })
+        _write(os.path.join(fixtures_dir, 'careers', f"{player['id']}.json"), _frame_payload(career))
+
+        for season_number, season_id in enumerate(SEASONS):
+            shots = synthetic_shots(shots_per_season, player['id'], TEAM_ID,
+                                    seed=seed + player_number * 100 + season_number)
+            path = os.path.join(fixtures_dir, 'shotcharts', 'regular_season', season_id,
+                                f"{player['id']}_{TEAM_ID}.json")
+            _write(path, {'shots': _frame_payload(shots), 'league_averages': _frame_payload(league)})
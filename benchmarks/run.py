@@ -0,0 +1,165 @@
+"""
+Benchmark the request pipeline offline.
+
+Shot data comes from synthetic fixtures served by LocalProvider and AI analysis
+from the stub model, so runs need no network access and are repeatable. Results
+are written as JSON so runs from different releases can be compared.
+
+Measured:
+    draw_court                     court shape construction
+    draw_plot[scatter|density]     uncached chart rendering at small, typical and large shot counts
+    aggregate_zones                zone and league aggregation as done for /result
+    result, comparison_result      end-to-end requests through the Flask test client
+    career                         /result for a 20-season career
+    chart_template, shot_chart     the JSON endpoints browser-rendered charts are drawn from
+                                   (with the default CHART_RENDERING=client the pages above do no chart work)
+    result_page_load               /result plus the chart requests its page makes, i.e. a full page view
+    startup                        worker boot time (see startup.py), with --startup
+
+Usage:
+    python benchmarks/run.py
+    python benchmarks/run.py --repeat 20 --output benchmarks/results.json --startup
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+SHOT_COUNTS = {'small': 200, 'typical': 1500, 'large': 20000}
+
+
+def _timings(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {
+        'median_ms': statistics.median(samples) * 1000,
+        'min_ms': min(samples) * 1000,
+        'max_ms': max(samples) * 1000,
+        'runs': repeat
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(repeat, include_startup=False):
+    """
+    Returns:
+        dict: {'meta': {...}, 'results': {benchmark name: timings}}
+    """
+    work_dir = tempfile.mkdtemp(prefix='nba-bench-')
+    fixtures_dir = os.path.join(work_dir, 'fixtures')
+    # Configure the app before it is imported: offline data, stub AI, isolated caches
+    os.environ.update({
+        'NBA_DATA_PROVIDER': 'local',
+        'NBA_FIXTURES_DIR': fixtures_dir,
+        'NBA_CACHE_DIR': os.path.join(work_dir, 'cache'),
+        'SHOT_WAREHOUSE_DIR': os.path.join(work_dir, 'warehouse'),
+        'GEMINI_MODEL': 'stub',
+    })
+
+    import fixtures
+    fixtures.write_fixtures(fixtures_dir)
+
+    from NBA_Shot_Charts import create_app, plotting, stats
+    results = {}
+
+    results['draw_court'] = _timings(plotting.draw_court, repeat * 10)
+
+    league_df = fixtures.league_averages()
+    for label, count in SHOT_COUNTS.items():
+        shot_df = fixtures.synthetic_shots(count)
+        for mode in ('scatter', 'density'):
+            results[f"draw_plot[{mode},{label}={count}]"] = _timings(
+                lambda: plotting.draw_plot(shot_df, 'Benchmark', mode=mode), repeat
+            )
+        results[f"aggregate_zones[{label}={count}]"] = _timings(
+            lambda: stats.compute_shot_stats(shot_df, league_df), repeat * 10
+        )
+
+    app = create_app()
+    app.testing = True
+    client = app.test_client()
+    curry, lebron, jokic, kobe = (player['id'] for player in fixtures.PLAYERS)
+    requests = {
+        'result': [('POST', '/result', {'player_name': 'Stephen Curry', 'season_id': '2022-23'})],
+        'comparison_result': [('POST', '/comparison-result', {
+            'player1_name': 'Stephen Curry', 'season1_id': '2022-23',
+            'player2_name': 'LeBron James', 'season2_id': '2021-22'
+        })],
+        'chart_template': [('GET', '/api/chart-template', None)],
+        'shot_chart[scatter]': [('GET', f'/api/shot-chart/{curry}/2021-22', None)],
+        'shot_chart[density]': [('GET', f'/api/shot-chart/{curry}/2020-21?mode=density', None)],
+        'result_page_load': [
+            ('POST', '/result', {'player_name': 'Kobe Bryant', 'season_id': '2019-20'}),
+            ('GET', '/api/chart-template', None),
+            ('GET', f'/api/shot-chart/{kobe}/2019-20', None),
+        ],
+        'career': [('POST', '/result', {'player_name': 'Nikola Jokić', 'season_id': 'career'})],
+        'shot_chart[career]': [('GET', f'/api/shot-chart/{lebron}/career', None)],
+    }
+    for name, steps in requests.items():
+        def send():
+            for method, url, form in steps:
+                response = client.open(url, method=method, data=form)
+                assert response.status_code == 200, f"{url} returned {response.status_code}"
+
+        results[f"{name}[cold]"] = _timings(send, 1)
+        warm = _timings(send, repeat)
+        warm['requests_per_second'] = 1000 / warm['median_ms']
+        results[f"{name}[warm]"] = warm
+
+    if include_startup:
+        import startup
+        for mode, phases in startup.measure(max(repeat // 5, 1)).items():
+            for phase, seconds in phases.items():
+                results[f"startup[{mode},{phase}]"] = {'median_ms': seconds * 1000}
+
+    return {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': repeat
+        },
+        'results': results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the request pipeline offline.')
+    parser.add_argument('--repeat', type=int, default=10, help='Timed runs per benchmark')
+    parser.add_argument('--output', default='benchmark_results.json', help='Where to write the JSON results')
+    parser.add_argument('--startup', action='store_true', help='Also measure worker startup time (slower)')
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.repeat, args.startup)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    for name, timings in report['results'].items():
+        print(f"{name:<45} {timings['median_ms']:>10.2f} ms")
+    print(f"\nWrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Measure worker startup time.
+
+Each run starts a fresh interpreter, as a gunicorn worker would, and times
+importing the app, create_app(), and the first player lookup (which builds or
+loads the player index). Runs are repeated with an empty cache directory
+(cold) and with the saved player index already on disk (warm).
+
+Usage:
+    python benchmarks/startup.py
+    python benchmarks/startup.py --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_WORKER_SCRIPT = """
+import json, time
+start = time.perf_counter()
+from NBA_Shot_Charts import create_app
+app = create_app()
+booted = time.perf_counter()
+from NBA_Shot_Charts import data
+data.find_player('Stephen Curry')
+looked_up = time.perf_counter()
+print(json.dumps({'create_app': booted - start, 'first_lookup': looked_up - booted}))
+"""
+
+
+def _run_worker(cache_dir):
+    env = dict(os.environ, NBA_CACHE_DIR=cache_dir)
+    output = subprocess.run(
+        [sys.executable, '-c', _WORKER_SCRIPT],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure(runs):
+    """
+    Returns:
+        dict: Median seconds for each phase, for cold and warm starts.
+    """
+    results = {}
+    for mode in ('cold', 'warm'):
+        samples = []
+        with tempfile.TemporaryDirectory() as cache_dir:
+            if mode == 'warm':
+                _run_worker(cache_dir)  # Saves the player index snapshot
+            for _ in range(runs):
+                if mode == 'cold':
+                    with tempfile.TemporaryDirectory() as fresh_dir:
+                        samples.append(_run_worker(fresh_dir))
+                else:
+                    samples.append(_run_worker(cache_dir))
+        results[mode] = {
+            phase: statistics.median(sample[phase] for sample in samples)
+            for phase in ('create_app', 'first_lookup')
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure worker startup time.')
+    parser.add_argument('--runs', type=int, default=5, help='Interpreter launches per mode')
+    args = parser.parse_args()
+
+    results = measure(args.runs)
+    for mode, phases in results.items():
+        print(f"{mode:>5}: create_app {phases['create_app'] * 1000:.0f} ms, "
+              f"first lookup {phases['first_lookup'] * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Bulk-download shot chart data into the local shot warehouse.
+
+Fetches ShotChartDetail for every player in every finished season from
+EARLIEST_SEASON_YEAR onward and stores one partition per season. The run is
+checkpointed after every player, so it can be stopped and restarted at any time.
+
+Usage:
+    python ingest.py
+    python ingest.py --seasons 2021-22 2022-23 --delay 1.0
+"""
+import argparse
+import time
+
+from NBA_Shot_Charts import warehouse
+from NBA_Shot_Charts.data import (
+    EARLIEST_SEASON_YEAR,
+    current_season_year,
+    season_id_from_year,
+)
+from NBA_Shot_Charts.providers import get_provider
+
+
+def _call_with_retries(fetch, retries, delay):
+    """Call fetch(), retrying with exponential backoff on failure."""
+    for attempt in range(retries + 1):
+        try:
+            return fetch()
+        except Exception as e:
+            if attempt == retries:
+                raise
+            wait = delay * (2 ** (attempt + 1))
+            print(f"  Request failed ({e}); retrying in {wait:.1f}s")
+            time.sleep(wait)
+
+
+def ingest_season(season_id, season_type, delay, retries, warehouse_dir=None):
+    """Download every player's shots for one season, skipping players already checkpointed."""
+    if warehouse.is_season_complete(season_id, season_type, warehouse_dir):
+        print(f"{season_id}: already complete, skipping")
+        return
+
+    provider = get_provider()
+    player_stats = _call_with_retries(
+        lambda: provider.get_season_players(season_id, season_type),
+        retries, delay
+    )
+    player_ids = sorted(set(int(player_id) for player_id in player_stats['PLAYER_ID']))
+    done = warehouse.load_checkpoint(season_id, season_type, warehouse_dir)
+    print(f"{season_id}: {len(player_ids)} players, {len(done)} already ingested")
+
+    for player_id in player_ids:
+        if player_id in done:
+            continue
+
+        time.sleep(delay)
+        # team_id=0 returns the player's shots for every team they played for that season
+        shot_df, league_avg_df = _call_with_retries(
+            lambda: provider.get_shot_chart(player_id, 0, season_id, season_type),
+            retries, delay
+        )
+
+        warehouse.write_player_part(season_id, player_id, shot_df, season_type, warehouse_dir)
+        if not done:
+            warehouse.write_league_averages(season_id, league_avg_df, season_type, warehouse_dir)
+        done.add(player_id)
+        warehouse.save_checkpoint(season_id, done, season_type, warehouse_dir)
+        print(f"  {season_id}: player {player_id} ({len(shot_df)} shots) [{len(done)}/{len(player_ids)}]")
+
+    warehouse.compact_season(season_id, season_type, warehouse_dir)
+    print(f"{season_id}: complete")
+
+
+def main():
+    finished_seasons = [
+        season_id_from_year(year)
+        for year in range(EARLIEST_SEASON_YEAR, current_season_year())
+    ]
+
+    parser = argparse.ArgumentParser(description='Bulk-download shot chart data into the local warehouse.')
+    parser.add_argument('--seasons', nargs='+', default=finished_seasons,
+                        help='Season IDs to ingest (default: every finished season since EARLIEST_SEASON_YEAR)')
+    parser.add_argument('--season-type', default='Regular Season', help="e.g. 'Regular Season' or 'Playoffs'")
+    parser.add_argument('--delay', type=float, default=0.6, help='Seconds to wait between requests')
+    parser.add_argument('--retries', type=int, default=3, help='Retries per request before giving up')
+    parser.add_argument('--warehouse-dir', default=None, help='Warehouse location (default: SHOT_WAREHOUSE_DIR)')
+    args = parser.parse_args()
+
+    for season_id in args.seasons:
+        ingest_season(season_id, args.season_type, args.delay, args.retries, args.warehouse_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+import os
+import sys
+import tempfile
+import threading
+
+import pytest
+
+# Configure the app before it is imported: isolated caches and warehouse, stub AI
+_work_dir = tempfile.mkdtemp(prefix='nba-tests-')
+os.environ.update({
+    'NBA_CACHE_DIR': os.path.join(_work_dir, 'cache'),
+    'SHOT_WAREHOUSE_DIR': os.path.join(_work_dir, 'warehouse'),
+    'GEMINI_MODEL': 'stub',
+})
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import fixtures  # noqa: E402
+from NBA_Shot_Charts import data, providers, resilience  # noqa: E402
+
+
+class FakeClock:
+    """
+    Stands in for time.monotonic/time.sleep: sleeping advances the clock instantly.
+    With frozen=True sleeps are only recorded, as if every caller arrived at the same moment.
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+        self.frozen = False
+        self.sleeps = []
+        self._lock = threading.Lock()
+
+    def monotonic(self):
+        with self._lock:
+            return self.now
+
+    def sleep(self, seconds):
+        with self._lock:
+            self.sleeps.append(seconds)
+            if not self.frozen:
+                self.now += max(seconds, 0)
+
+
+class FakeRemoteProvider(providers.DataProvider):
+    """A remote provider serving synthetic data, counting calls per kind."""
+
+    remote = True
+
+    def __init__(self, seasons=fixtures.SEASONS, delay=0):
+        self.seasons = list(seasons)
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _record(self, *call):
+        with self._lock:
+            self.calls.append(call)
+        if self.delay:
+            threading.Event().wait(self.delay)
+
+    def get_player_career(self, player_id):
+        import pandas as pd
+        self._record('career', player_id)
+        return pd.DataFrame({'PLAYER_ID': player_id, 'SEASON_ID': self.seasons, 'TEAM_ID': fixtures.TEAM_ID})
+
+    def get_shot_chart(self, player_id, team_id, season_id, season_type='Regular Season'):
+        self._record('shot_chart', player_id, season_id)
+        return fixtures.synthetic_shots(50, player_id, team_id), fixtures.league_averages()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(resilience.time, 'monotonic', fake.monotonic)
+    monkeypatch.setattr(resilience.time, 'sleep', fake.sleep)
+    return fake
+
+
+@pytest.fixture
+def upstream(clock, monkeypatch):
+    """Fresh rate limiter and circuit breaker with the default settings, on the fake clock."""
+    monkeypatch.setattr(resilience, '_bucket', resilience.TokenBucket(resilience.UPSTREAM_RATE,
+                                                                      resilience.UPSTREAM_BURST))
+    monkeypatch.setattr(resilience, '_breaker', resilience.CircuitBreaker(resilience.BREAKER_FAILURES,
+                                                                          resilience.BREAKER_RESET))
+
+
+@pytest.fixture
+def provider(upstream):
+    """Install a FakeRemoteProvider over empty data caches."""
+    fake = FakeRemoteProvider()
+    previous = providers._provider
+    providers.set_provider(fake)
+    for cache in (data._career_cache, data._shot_cache):
+        cache.clear()
+    yield fake
+    providers.set_provider(previous)
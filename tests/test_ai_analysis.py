@@ -0,0 +1,58 @@
+import pytest
+
+from NBA_Shot_Charts import ai_analysis
+
+
+class ChunkedModel:
+    """Streams a fixed Markdown answer in chunks that split a numbered list across blank lines."""
+
+    model_name = 'models/gemini-2.5-flash'
+    text = "Key points:\n\n1. Elite at the rim\n\n2. Streaky from three\n\n3. Avoids the midrange"
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        self.calls += 1
+        chunks = [ai_analysis.StubModel._Response(self.text[i:i + 7]) for i in range(0, len(self.text), 7)]
+        return chunks if stream else ai_analysis.StubModel._Response(self.text)
+
+
+@pytest.fixture
+def model():
+    """Install a ChunkedModel over an empty analysis cache."""
+    fake = ChunkedModel()
+    previous = ai_analysis._model
+    ai_analysis.set_model(fake)
+    ai_analysis._analysis_cache.clear()
+    yield fake
+    ai_analysis.set_model(previous)
+
+
+def test_stub_model_is_deterministic():
+    stub = ai_analysis.StubModel()
+    first = stub.generate_content("Analyze LeBron James\nmore stats").text
+    assert first == stub.generate_content("Analyze LeBron James\nmore stats").text
+    assert first != stub.generate_content("Analyze Stephen Curry").text
+    streamed = ''.join(chunk.text for chunk in stub.generate_content("Analyze LeBron James\nmore stats", stream=True))
+    assert streamed == first
+
+
+def test_streamed_answer_is_converted_from_the_full_text(model):
+    partials = []
+    html = ai_analysis._generate_html("prompt", "error", "fallback", on_partial=partials.append)
+    assert partials and partials[-1] != html
+    assert html.count('<ol>') == 1
+    assert html == ai_analysis._to_html(ChunkedModel.text)
+
+
+def test_answers_are_cached_per_prompt(model):
+    first = ai_analysis._generate_html("prompt", "error", "fallback")
+    assert ai_analysis._generate_html("prompt", "error", "fallback") == first
+    assert model.calls == 1
+
+
+def test_cache_keys_differ_per_model():
+    stub_key = ai_analysis._prompt_key(ai_analysis.StubModel(), "prompt")
+    assert stub_key != ai_analysis._prompt_key(ChunkedModel(), "prompt")
+    assert stub_key == ai_analysis._prompt_key(ai_analysis.StubModel(), "prompt")
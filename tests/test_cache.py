@@ -0,0 +1,60 @@
+import pytest
+
+from NBA_Shot_Charts import cache as cache_module
+from NBA_Shot_Charts.cache import DataCache
+
+
+@pytest.fixture
+def now(monkeypatch):
+    clock = {'now': 1_000_000.0}
+    monkeypatch.setattr(cache_module.time, 'time', lambda: clock['now'])
+    return clock
+
+
+@pytest.fixture(params=[True, False], ids=['memory', 'disk'])
+def cache(request, tmp_path):
+    # 'disk' keeps no memory tier, so every lookup goes to SQLite
+    return DataCache('test', max_memory_items=128 if request.param else 0, cache_dir=str(tmp_path))
+
+
+def test_get_stale_returns_fresh_entries(cache, now):
+    cache.set('key', 'value', ttl=60)
+    assert cache.get_stale('key') == ('value', True)
+
+
+def test_get_stale_returns_expired_entries_that_get_ignores(cache, now):
+    cache.set('key', 'value', ttl=60)
+    now['now'] += 61
+    assert cache.get('key') is None
+    assert cache.get_stale('key') == ('value', False)
+
+
+def test_get_stale_drops_entries_past_max_stale(cache, now):
+    cache.set('key', 'value', ttl=60)
+    now['now'] += 60 + 100
+    assert cache.get_stale('key', max_stale=200) == ('value', False)
+    now['now'] += 100
+    assert cache.get_stale('key', max_stale=200) == (None, False)
+
+
+def test_get_stale_misses_unknown_keys(cache):
+    assert cache.get_stale('missing') == (None, False)
+    assert cache.misses == 1
+
+
+def test_entries_without_ttl_never_go_stale(cache, now):
+    cache.set(('tuple', 1), 'value')
+    now['now'] += 10 ** 9
+    assert cache.get_stale(('tuple', 1)) == ('value', True)
+
+
+def test_purge_expired_deletes_only_expired_rows(tmp_path, now):
+    cache = DataCache('test', max_memory_items=0, cache_dir=str(tmp_path))
+    cache.set('old', 1, ttl=10)
+    cache.set('new', 2, ttl=100)
+    cache.set('forever', 3)
+    now['now'] += 50
+    assert cache.purge_expired() == 1
+    assert cache.get_stale('old') == (None, False)
+    assert cache.get('new') == 2
+    assert cache.get('forever') == 3
@@ -0,0 +1,78 @@
+import threading
+import time
+
+import pytest
+
+from NBA_Shot_Charts.coalesce import SingleFlight, process_lock
+
+
+def _run_together(count, target):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+
+def test_single_flight_shares_one_result():
+    flight = SingleFlight()
+    calls = []
+    results = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.2)
+        return 'value'
+
+    _run_together(8, lambda: results.append(flight.do('key', fetch)))
+    assert len(calls) == 1
+    assert results == ['value'] * 8
+
+
+def test_single_flight_shares_the_exception():
+    flight = SingleFlight()
+    calls = []
+    errors = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.2)
+        raise ValueError('boom')
+
+    def call():
+        try:
+            flight.do('key', fetch)
+        except ValueError as e:
+            errors.append(e)
+
+    _run_together(4, call)
+    assert len(calls) == 1
+    assert len(errors) == 4
+    # The key is released afterwards, so a later call runs again
+    with pytest.raises(ValueError):
+        flight.do('key', fetch)
+    assert len(calls) == 2
+
+
+def test_single_flight_keys_are_independent():
+    flight = SingleFlight()
+    assert flight.do('a', lambda: 1) == 1
+    assert flight.do('b', lambda: 2) == 2
+
+
+def test_process_lock_is_exclusive_per_key(tmp_path):
+    inside = []
+    overlaps = []
+
+    def hold():
+        with process_lock('test', ('key', 1), lock_dir=str(tmp_path)):
+            if inside:
+                overlaps.append(1)
+            inside.append(1)
+            time.sleep(0.05)
+            inside.pop()
+
+    _run_together(4, hold)
+    assert not overlaps
+    with process_lock('test', ('other', 2), lock_dir=str(tmp_path)):
+        pass
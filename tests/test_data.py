@@ -0,0 +1,51 @@
+import threading
+
+from benchmarks import fixtures
+from NBA_Shot_Charts import data, multiseason
+
+
+def test_twenty_season_career_loads_under_the_default_rate_limit(provider, clock):
+    # Frozen clock: every season fetch asks for a request slot at the same moment
+    clock.frozen = True
+    multiseason._aggregate_cache.clear()
+    player_id = fixtures.PLAYERS[0]['id']
+
+    aggregates = multiseason.get_season_aggregates(player_id, fixtures.SEASONS)
+
+    assert len(fixtures.SEASONS) == 20
+    assert list(aggregates) == fixtures.SEASONS
+    assert sum(1 for call in provider.calls if call[0] == 'shot_chart') == 20
+
+
+def test_workers_waiting_on_the_process_lock_reuse_the_fetched_result(provider):
+    provider.delay = 0.2
+    player_id = fixtures.PLAYERS[1]['id']
+    season_id = fixtures.SEASONS[-1]
+    cache_key = (data._SHOT_CACHE_VERSION, player_id, season_id, 'Regular Season')
+    results = []
+
+    # Call the loader directly, bypassing the in-process SingleFlight, as separate workers would
+    def load():
+        results.append(data._load_player_shotchartdetail(cache_key, player_id, season_id, 'Regular Season'))
+
+    threads = [threading.Thread(target=load) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert len(results) == 4
+    assert sum(1 for call in provider.calls if call[0] == 'shot_chart') == 1
+
+
+def test_concurrent_requests_share_one_fetch(provider):
+    provider.delay = 0.2
+    player_id = fixtures.PLAYERS[2]['id']
+    threads = [threading.Thread(target=data.get_player_shotchartdetail, args=(player_id, fixtures.SEASONS[-1]))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert [call[0] for call in provider.calls] == ['career', 'shot_chart']
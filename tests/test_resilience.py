@@ -0,0 +1,157 @@
+import threading
+
+import pytest
+import requests
+
+from NBA_Shot_Charts import resilience
+
+
+def _failing(error):
+    def fn():
+        fn.calls += 1
+        raise error
+    fn.calls = 0
+    return fn
+
+
+# --- TokenBucket ---
+
+def test_bucket_allows_burst_then_refuses_without_waiting(clock):
+    bucket = resilience.TokenBucket(rate=2, capacity=3)
+    assert all(bucket.acquire(timeout=0) for _ in range(3))
+    assert not bucket.acquire(timeout=0.4)
+    # A refused caller reserves nothing
+    clock.sleep(0.5)
+    assert bucket.acquire(timeout=0)
+
+
+def test_bucket_reserves_tokens_in_arrival_order(clock):
+    clock.frozen = True
+    bucket = resilience.TokenBucket(rate=2, capacity=1)
+    assert all(bucket.acquire(timeout=10) for _ in range(4))
+    # Each caller waits one token's worth (0.5s) longer than the one before it
+    assert clock.sleeps == [0.5, 1.0, 1.5]
+
+
+def test_bucket_refuses_when_reservation_exceeds_timeout(clock):
+    clock.frozen = True
+    bucket = resilience.TokenBucket(rate=1, capacity=1)
+    assert bucket.acquire(timeout=0)
+    assert bucket.acquire(timeout=1)  # Reserves the token due in 1s
+    assert not bucket.acquire(timeout=1.5)  # The next one would be due in 2s
+    clock.now += 2
+    assert bucket.acquire(timeout=0)
+
+
+# --- CircuitBreaker ---
+
+def test_breaker_opens_after_threshold_and_lets_one_trial_through(clock):
+    breaker = resilience.CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    breaker.record_failure()
+    assert breaker.state == 'closed'
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    assert not breaker.allow()
+
+    clock.sleep(30)
+    assert breaker.state == 'half-open'
+    assert breaker.allow()
+    assert not breaker.allow()  # Only one trial at a time
+
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    assert breaker.allow()
+
+
+def test_failed_trial_reopens_the_circuit(clock):
+    breaker = resilience.CircuitBreaker(failure_threshold=5, reset_timeout=30)
+    for _ in range(5):
+        breaker.record_failure()
+    clock.sleep(30)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    assert not breaker.allow()
+
+
+# --- call ---
+
+def test_call_counts_one_breaker_failure_per_call(clock, upstream):
+    fn = _failing(requests.ConnectionError('reset'))
+    for _ in range(resilience.BREAKER_FAILURES - 1):
+        with pytest.raises(requests.ConnectionError):
+            resilience.call(fn)
+    assert fn.calls == (resilience.BREAKER_FAILURES - 1) * (resilience.UPSTREAM_RETRIES + 1)
+    assert resilience.upstream_state() == 'closed'
+
+    with pytest.raises(requests.ConnectionError):
+        resilience.call(fn)
+    assert resilience.upstream_state() == 'open'
+    with pytest.raises(resilience.UpstreamUnavailableError):
+        resilience.call(lambda: 'not called')
+
+
+@pytest.mark.parametrize('error', [FileNotFoundError('no such player'), ValueError('bad id'), KeyError('x')])
+def test_call_raises_non_transient_errors_at_once(clock, upstream, error):
+    fn = _failing(error)
+    for _ in range(resilience.BREAKER_FAILURES + 1):
+        with pytest.raises(type(error)):
+            resilience.call(fn)
+    assert fn.calls == resilience.BREAKER_FAILURES + 1  # No retries
+    assert resilience.upstream_state() == 'closed'
+    assert resilience.call(lambda: 'ok') == 'ok'
+
+
+def test_http_429_and_5xx_are_transient():
+    def http_error(status):
+        response = requests.Response()
+        response.status_code = status
+        return requests.HTTPError(response=response)
+
+    assert resilience.is_transient(http_error(429))
+    assert resilience.is_transient(http_error(503))
+    assert not resilience.is_transient(http_error(404))
+    assert resilience.is_transient(requests.Timeout())
+
+
+def test_call_retries_then_succeeds(clock, upstream):
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 2:
+            raise requests.Timeout('slow')
+        return 'ok'
+
+    assert resilience.call(flaky) == 'ok'
+    assert len(attempts) == 2
+    assert resilience.upstream_state() == 'closed'
+
+
+def test_batch_rate_wait_lets_a_whole_batch_queue(clock, upstream):
+    # Frozen clock: all calls arrive together, like a career page's season fetches
+    clock.frozen = True
+    count = 20
+    rate_wait = resilience.batch_rate_wait(count)
+    results = [resilience.call(lambda: 'ok', rate_wait=rate_wait) for _ in range(count)]
+    assert results == ['ok'] * count
+    # Without the batch allowance the same burst is refused
+    clock.now += 60
+    with pytest.raises(resilience.UpstreamUnavailableError):
+        for _ in range(count):
+            resilience.call(lambda: 'ok')
+
+
+def test_refresh_in_background_runs_once_per_key():
+    release = threading.Event()
+    calls = []
+
+    def refresh():
+        calls.append(1)
+        release.wait(5)
+
+    resilience.refresh_in_background('key', refresh)
+    resilience.refresh_in_background('key', refresh)
+    release.set()
+    resilience._refresh_pool.submit(lambda: None).result(5)
+    assert len(calls) == 1